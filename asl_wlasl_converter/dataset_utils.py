@@ -9,8 +9,14 @@ This module provides functions for working with the WLASL dataset:
 
 import os
 import json
+import mmap
 import random
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Set, Tuple, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class WLASLDataset:
@@ -26,6 +32,7 @@ class WLASLDataset:
         """
         self.json_path = json_path
         self.videos_dir = videos_dir
+        self.available_videos = self._scan_videos_dir()
         self.data = self._load_json()
         self.gloss_to_videos = self._build_gloss_to_videos_mapping()
         self.id_to_gloss = self._build_id_to_gloss_mapping()
@@ -33,8 +40,21 @@ class WLASLDataset:
         
     def _load_json(self) -> List[Dict]:
         """Load the WLASL JSON file."""
-        with open(self.json_path, 'r') as f:
-            return json.load(f)
+        if orjson is None or os.path.getsize(self.json_path) == 0:
+            with open(self.json_path, 'r') as f:
+                return json.load(f)
+        
+        # Parse the memory-mapped bytes directly, skipping the read copy and str decode
+        with open(self.json_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            return orjson.loads(view)
+    
+    def _scan_videos_dir(self) -> Set[str]:
+        """Scan the videos directory once and return the set of filenames in it."""
+        if not os.path.isdir(self.videos_dir):
+            return set()
+        return {entry.name for entry in os.scandir(self.videos_dir) if entry.is_file()}
     
     def _build_gloss_to_videos_mapping(self) -> Dict[str, List[str]]:
         """Build a mapping from gloss (word) to list of video filenames."""
@@ -53,8 +73,7 @@ class WLASLDataset:
                     video_filename = f"{instance['instance_id']:05d}.mp4"
                 
                 # Check if the video file exists
-                video_path = os.path.join(self.videos_dir, video_filename)
-                if os.path.exists(video_path):
+                if video_filename in self.available_videos:
                     videos.append(video_filename)
             
             if videos:  # Only add entry if there are valid videos
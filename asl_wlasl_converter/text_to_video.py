@@ -21,6 +21,16 @@ from moviepy import VideoFileClip, concatenate_videoclips
 
 from dataset_utils import WLASLDataset, text_to_gloss
 
+# Encoder settings for stitched output videos. These are short-lived demo
+# clips, so encode speed matters far more than file size.
+VIDEO_WRITE_OPTIONS = {
+    "codec": "libx264",
+    "audio": False,
+    "preset": "ultrafast",
+    "threads": os.cpu_count(),
+    "ffmpeg_params": ["-tune", "zerolatency", "-crf", "28"],
+}
+
 
 def detect_homonyms(text: str, words: List[str]) -> Dict[str, str]:
     """
@@ -318,8 +328,8 @@ def create_asl_video_from_text(
         for path in video_paths:
             clip = VideoFileClip(path)
             
-            # Resize if needed
-            if resize_videos:
+            # Resize if needed (skip clips already at the target size)
+            if resize_videos and tuple(clip.size) != tuple(target_size):
                 clip = clip.resize(target_size)
             
             clips.append(clip)
@@ -331,7 +341,7 @@ def create_asl_video_from_text(
             final_clip = concatenate_videoclips(clips, method="chain")
         
         # Write the final video
-        final_clip.write_videofile(output_path, codec="libx264", audio=False)
+        final_clip.write_videofile(output_path, **VIDEO_WRITE_OPTIONS)
         print(f"ASL video created: {output_path}")
         
         # Clean up
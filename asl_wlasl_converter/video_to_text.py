@@ -8,7 +8,10 @@ It implements a simplified interface to the WLASL pretrained models.
 import os
 import sys
 import argparse
+import functools
+import hashlib
 import json
+import uuid
 import numpy as np
 import cv2
 import torch
@@ -18,6 +21,14 @@ from dataset_utils import WLASLDataset
 # Placeholder constants - these would need to be updated based on the actual model
 MODEL_INPUT_SIZE = (224, 224)
 NUM_FRAMES = 64  # Typical for I3D models
+# WLASL's I3D test transform scales the shorter side to 226 and center-crops 224
+RESIZE_SHORT_SIDE = 226
+
+# Decoded and resized frames for dataset videos are kept here between runs
+PREPROCESSED_CACHE_DIR = os.environ.get(
+    'ASL_PREP_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'prep')
+)
 
 
 class VideoProcessor:
@@ -34,12 +45,22 @@ class VideoProcessor:
         self.target_frames = target_frames
         self.target_size = target_size
     
-    def process_video(self, video_path: str) -> Optional[np.ndarray]:
+    def _preprocessed_path(self, video_path: str) -> str:
+        """Get the cache file for a video's frames at the current settings."""
+        stat = os.stat(video_path)
+        key = (
+            f"{os.path.abspath(video_path)}|{stat.st_mtime_ns}|{stat.st_size}|"
+            f"{self.target_frames}|{self.target_size}|{RESIZE_SHORT_SIDE}"
+        )
+        return os.path.join(PREPROCESSED_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.npy')
+    
+    def process_video(self, video_path: str, use_cache: bool = False) -> Optional[np.ndarray]:
         """
         Process a video for input to the model.
         
         Args:
             video_path: Path to the video file
+            use_cache: Reuse decoded frames saved on disk by an earlier call
             
         Returns:
             Processed video frames as a numpy array, or None if processing failed
@@ -48,6 +69,45 @@ class VideoProcessor:
             print(f"Error: Video file not found: {video_path}")
             return None
         
+        if use_cache:
+            cache_path = self._preprocessed_path(video_path)
+            if os.path.exists(cache_path):
+                return np.divide(np.load(cache_path), 255.0, dtype=np.float32)
+        
+        frames = self._decode_frames(video_path)
+        if frames is None:
+            return None
+        
+        if use_cache:
+            # Frames are stored as uint8 to keep the cache a quarter of the float size
+            tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp.npy"
+            try:
+                os.makedirs(PREPROCESSED_CACHE_DIR, exist_ok=True)
+                np.save(tmp_path, frames)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Warning: Could not cache frames for {video_path}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        
+        # Normalize pixel values to [0, 1]
+        return np.divide(frames, 255.0, dtype=np.float32)
+    
+    def _resize_and_crop(self, frame: np.ndarray) -> np.ndarray:
+        """Scale the shorter side to RESIZE_SHORT_SIDE, keeping the aspect ratio, and center-crop to target_size."""
+        target_width, target_height = self.target_size
+        height, width = frame.shape[:2]
+        scale = RESIZE_SHORT_SIDE / min(height, width)
+        new_width = max(target_width, round(width * scale))
+        new_height = max(target_height, round(height * scale))
+        frame = cv2.resize(frame, (new_width, new_height))
+        
+        top = (new_height - target_height) // 2
+        left = (new_width - target_width) // 2
+        return np.ascontiguousarray(frame[top:top + target_height, left:left + target_width])
+    
+    def _decode_frames(self, video_path: str) -> Optional[np.ndarray]:
+        """Sample, resize and convert frames to RGB; returns uint8 frames or None."""
         try:
             # Open the video
             cap = cv2.VideoCapture(video_path)
@@ -76,8 +136,8 @@ class VideoProcessor:
                         frames.append(frames[-1])
                     continue
                 
-                # Resize frame
-                frame = cv2.resize(frame, self.target_size)
+                # Resize and crop frame
+                frame = self._resize_and_crop(frame)
                 
                 # Convert to RGB (from BGR)
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -95,12 +155,7 @@ class VideoProcessor:
                     return None
             
             # Convert to numpy array: (num_frames, height, width, channels)
-            frames_array = np.array(frames)
-            
-            # Normalize pixel values to [0, 1]
-            frames_array = frames_array / 255.0
-            
-            return frames_array
+            return np.array(frames, dtype=np.uint8)
             
         except Exception as e:
             print(f"Error processing video {video_path}: {e}")
@@ -118,53 +173,79 @@ class I3DPredictor:
     def __init__(
         self, 
         model_path: str,
-        dataset: WLASLDataset
+        dataset: Optional[WLASLDataset] = None
     ):
         """
         Initialize the I3D predictor.
         
         Args:
             model_path: Path to the pretrained I3D model
-            dataset: WLASL dataset object for class mapping
+            dataset: Default WLASL dataset object for class mapping; can be
+                overridden per call to predict
         """
         self.model_path = model_path
         self.dataset = dataset
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.processor = VideoProcessor()
         
-        # For now, we'll just print a message about model loading
-        # In a real implementation, you would load the actual model
-        print(f"Note: This implementation requires you to clone the WLASL repository")
-        print(f"and download the pretrained I3D model from their GitHub page.")
-        print(f"Would load model from: {model_path}")
-        
         # Placeholder for the actual model
         self.model = None
+        
+        # A fully pickled model can be used as-is; a bare state dict needs the
+        # I3D architecture from the WLASL repository, which isn't bundled here
+        if os.path.exists(model_path):
+            try:
+                loaded = self._load_checkpoint(model_path)
+                if isinstance(loaded, torch.nn.Module):
+                    self.model = loaded.to(self.device).eval()
+                    print(f"Loaded model from: {model_path}")
+            except Exception as e:
+                print(f"Error loading model from {model_path}: {e}")
+        
+        if self.model is None:
+            print(f"Note: This implementation requires you to clone the WLASL repository")
+            print(f"and download the pretrained I3D model from their GitHub page.")
+            print(f"Would load model from: {model_path}")
+    
+    def _load_checkpoint(self, model_path: str):
+        """Load a checkpoint, allowing full pickled modules on torch >= 2.6."""
+        try:
+            return torch.load(model_path, map_location=self.device, weights_only=False)
+        except TypeError:
+            # torch < 1.13 has no weights_only argument and always unpickles fully
+            return torch.load(model_path, map_location=self.device)
     
-    def predict(self, video_path: str, top_k: int = 5) -> List[Tuple[str, float]]:
+    def predict(
+        self,
+        video_path: str,
+        top_k: int = 5,
+        use_cache: bool = False,
+        dataset: Optional[WLASLDataset] = None
+    ) -> List[Tuple[str, float]]:
         """
         Predict ASL signs from a video.
         
         Args:
             video_path: Path to the video file
             top_k: Number of top predictions to return
+            use_cache: Reuse preprocessed frames cached on disk for this video
+            dataset: WLASL dataset object for class mapping; defaults to the
+                one given at construction
             
         Returns:
             List of (word, confidence) tuples for the top-k predictions
         """
-        # For demonstration purposes, we'll return random predictions
-        # In a real implementation, you would process the video and run the model
         print(f"Processing video: {video_path}")
+        if dataset is None:
+            dataset = self.dataset
         
-        # In a real implementation, you would do:
-        # 1. Process the video into the right format
-        # frames = self.processor.process_video(video_path)
-        # 2. Convert to torch tensor and move to device
-        # 3. Run the model
-        # 4. Get the predictions
+        if self.model is not None:
+            frames = self.processor.process_video(video_path, use_cache=use_cache)
+            if frames is not None:
+                return self._run_model(frames, top_k, dataset)
         
-        # For now, just return a random prediction
-        available_words = self.dataset.get_available_words()
+        # Without a model, return a random prediction for demonstration purposes
+        available_words = dataset.get_available_words()
         k = min(top_k, len(available_words))
         selected_words = np.random.choice(available_words, k, replace=False)
         confidences = np.random.random(k)
@@ -174,13 +255,67 @@ class I3DPredictor:
         predictions.sort(key=lambda x: x[1], reverse=True)
         
         return predictions
+    
+    def _run_model(self, frames: np.ndarray, top_k: int, dataset: WLASLDataset) -> List[Tuple[str, float]]:
+        """Run the loaded model on processed frames and map the top classes to glosses."""
+        # The WLASL I3D checkpoints were trained on pixels scaled to [-1, 1]
+        frames = np.asarray(frames, dtype=np.float32) * 2.0 - 1.0
+        
+        # (frames, height, width, channels) -> (batch, channels, frames, height, width)
+        inputs = torch.from_numpy(np.ascontiguousarray(frames))
+        inputs = inputs.permute(3, 0, 1, 2).unsqueeze(0).to(self.device)
+        
+        with torch.inference_mode():
+            logits = self.model(inputs)
+        
+        # I3D returns per-frame logits; average them over time
+        if logits.dim() == 3:
+            logits = logits.mean(dim=2)
+        probs = torch.softmax(logits[0], dim=0)
+        
+        k = min(top_k, probs.numel())
+        confidences, indices = torch.topk(probs, k)
+        return [
+            (dataset.id_to_gloss.get(int(i), str(int(i))), float(c))
+            for c, i in zip(confidences.tolist(), indices.tolist())
+        ]
+
+
+@functools.lru_cache(maxsize=2)
+def _load_predictor(model_path: str, model_mtime_ns: Optional[int]) -> I3DPredictor:
+    """Create the predictor for one version of a model file."""
+    return I3DPredictor(model_path)
+
+
+def get_predictor(model_path: str) -> I3DPredictor:
+    """
+    Get a shared predictor for a model.
+    
+    Creating a predictor loads the model onto the device, so instances are
+    cached and reused instead of being rebuilt for every video. The cache is
+    keyed on the model path and its modification time, so a model installed
+    or replaced after a placeholder was created gets loaded; pass the dataset
+    to predict.
+    
+    Args:
+        model_path: Path to the pretrained model
+        
+    Returns:
+        The cached I3DPredictor
+    """
+    try:
+        model_mtime_ns = os.stat(model_path).st_mtime_ns
+    except OSError:
+        model_mtime_ns = None
+    return _load_predictor(model_path, model_mtime_ns)
 
 
 def recognize_signs_from_video(
     video_path: str,
     dataset: WLASLDataset,
     model_path: str,
-    top_k: int = 5
+    top_k: int = 5,
+    use_cache: bool = False
 ) -> List[Tuple[str, float]]:
     """
     Recognize ASL signs from a video file.
@@ -190,12 +325,14 @@ def recognize_signs_from_video(
         dataset: WLASL dataset object
         model_path: Path to the pretrained model
         top_k: Number of top predictions to return
+        use_cache: Cache preprocessed frames on disk; meant for dataset videos
+            that get recognized repeatedly, not one-off uploads
         
     Returns:
         List of (word, confidence) tuples for the top-k predictions
     """
-    predictor = I3DPredictor(model_path, dataset)
-    return predictor.predict(video_path, top_k)
+    predictor = get_predictor(model_path)
+    return predictor.predict(video_path, top_k, use_cache, dataset)
 
 
 def main():
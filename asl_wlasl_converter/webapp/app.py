@@ -9,18 +9,40 @@ Features:
 """
 
 import os
+import re
 import sys
 import json
+import hashlib
+import mimetypes
+import functools
+import threading
+import time
 import uuid
 import tempfile
+import shutil
+import contextlib
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 import base64
 import io
 from PIL import Image
 import torch
-from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, abort, render_template, request, jsonify, send_from_directory, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.security import safe_join
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# File locks for the machine-wide encode limit; unavailable on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Add parent directory to path to import converter modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -29,9 +51,9 @@ sys.path.append(parent_dir)
 
 try:
     # Import core modules
-    from dataset_utils import WLASLDataset, text_to_gloss
-    from text_to_video import create_asl_video_from_text
-    from video_to_text import recognize_signs_from_video
+    from dataset_utils import WLASLDataset, text_to_gloss as _text_to_gloss
+    from text_to_video import create_asl_video_from_text, VIDEO_WRITE_OPTIONS
+    from video_to_text import recognize_signs_from_video, get_predictor
     
     # Import movie modules directly (necessary for compatibility)
     try:
@@ -103,11 +125,48 @@ except ModuleNotFoundError as e:
 
 app = Flask(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, falling back to the stdlib for unsupported types."""
+    
+    def dumps(self, obj, **kwargs):
+        # orjson can only indent by two spaces; anything else goes to the stdlib
+        indent = kwargs.get('indent')
+        if indent not in (None, 2):
+            return super().dumps(obj, **kwargs)
+        
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# orjson is optional; without it Flask's default JSON provider is used
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Configuration
 app.config['UPLOAD_FOLDER'] = os.path.join(current_dir, 'static', 'uploads')
 app.config['OUTPUT_FOLDER'] = os.path.join(current_dir, 'static', 'generated')
+app.config['JOBS_FOLDER'] = os.path.join(current_dir, 'jobs')
+app.config['LOCKS_FOLDER'] = os.path.join(app.config['JOBS_FOLDER'], 'locks')
 app.config['ALLOWED_EXTENSIONS'] = {'mp4', 'avi', 'mov', 'webm'}
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max upload size
+# When running behind Nginx (see nginx.conf.example), generated videos can be
+# handed to Nginx via X-Accel-Redirect instead of being streamed by Flask
+app.config['USE_X_ACCEL'] = os.environ.get('ASL_USE_X_ACCEL') == '1'
+app.config['X_ACCEL_PREFIX'] = '/internal/'
+app.config['X_ACCEL_VIDEOS_PREFIX'] = '/internal-videos/'
+# Under Apache mod_xsendfile, let send_from_directory emit X-Sendfile instead
+app.use_x_sendfile = os.environ.get('ASL_USE_X_SENDFILE') == '1'
 
 # Load API key from config.py file (which is gitignored)
 try:
@@ -137,19 +196,269 @@ else:
     DEFAULT_VIDEOS_DIR = os.path.join(parent_dir, 'data', 'videos')
 DEFAULT_MODEL_PATH = os.path.join(parent_dir, 'models', 'i3d_model.pth')
 
+# Demo homonym rules used when no OpenAI API key is configured:
+# word -> (context tokens, meaning if any token is present, default meaning)
+DEMO_HOMONYM_RULES = {
+    "bank": (frozenset({"money"}), "financial institution", "river edge"),
+    "bat": (frozenset({"fly"}), "animal", "baseball equipment"),
+    "bow": (frozenset({"respect"}), "bend forward", "tie ribbon"),
+    "light": (frozenset({"weight"}), "not heavy", "illumination"),
+    "star": (frozenset({"sky"}), "celestial body", "celebrity"),
+    "tie": (frozenset({"shirt"}), "neck accessory", "to fasten"),
+    "saw": (frozenset({"wood"}), "cutting tool", "past tense of see"),
+    "ring": (frozenset({"finger"}), "jewelry", "sound"),
+    "present": (frozenset({"birthday"}), "gift", "current time"),
+    "spring": (frozenset({"summer", "winter"}), "season", "coil"),
+    "rock": (frozenset({"hard", "ground"}), "stone", "music genre"),
+    "fair": (frozenset({"equal", "justice"}), "just", "carnival"),
+    "kind": (frozenset({"gentle", "good"}), "nice", "type"),
+    "letter": (frozenset({"post", "send"}), "mail", "alphabet character"),
+}
+DEMO_CONTEXT_TOKENS = frozenset().union(*(rule[0] for rule in DEMO_HOMONYM_RULES.values()))
+# Matches any context token at the start of a word, so "flying" still counts as "fly"
+DEMO_CONTEXT_RE = re.compile(r'\b(' + '|'.join(map(re.escape, sorted(DEMO_CONTEXT_TOKENS))) + r')')
+
 # Create upload and output directories if they don't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
+os.makedirs(app.config['JOBS_FOLDER'], exist_ok=True)
+os.makedirs(app.config['LOCKS_FOLDER'], exist_ok=True)
+
+
+_ALLOWED_EXT = frozenset(f'.{ext}' for ext in app.config['ALLOWED_EXTENSIONS'])
 
 
 def allowed_file(filename):
     """Check if file has allowed extension."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return os.path.splitext(filename)[1].lower() in _ALLOWED_EXT
+
+
+def upload_path(filename):
+    """
+    Get a unique path in the upload folder for an uploaded file.
+    
+    Only the extension of the client's filename is kept, so concurrent
+    uploads with the same name can't overwrite each other mid-recognition.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}{ext}")
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_gloss(text):
+    """Memoized gloss conversion; stored as a tuple so callers can't mutate it."""
+    return tuple(_text_to_gloss(text))
+
+
+def text_to_gloss(text):
+    """Convert text to ASL gloss, reusing results for repeated phrases."""
+    return list(_cached_gloss(text))
+
+
+def x_accel_response(internal_uri):
+    """Return an empty response telling Nginx to serve the file at an internal location."""
+    response = Response(mimetype=mimetypes.guess_type(internal_uri)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = internal_uri
+    return response
+
+
+def _load_clip(path, resize=True):
+    """
+    Open a source clip, optionally resized to 640x480.
+    
+    Clips that already have the target size are returned unscaled; the size
+    comes from the metadata ffmpeg reads when the clip is opened, so no extra
+    probe is needed.
+    
+    Each VideoFileClip spawns an ffmpeg reader that stays alive until the
+    clip is closed, so callers must close the returned clip when done.
+    """
+    clip = VideoFileClip(path)
+    # Many WLASL clips are already 640x480; skip the scale pass for those
+    if resize and tuple(clip.size) != (640, 480):
+        try:
+            # Different versions of MoviePy have different resize APIs
+            if hasattr(clip, 'resize_width'):
+                clip = clip.resize_width(640)
+            elif hasattr(clip, 'resize'):
+                clip = clip.resize((640, 480))
+            elif hasattr(clip, 'resize_height'):
+                clip = clip.resize_height(480)
+            else:
+                # Last resort - use the clip's fx method
+                from moviepy.video.fx import resize as resize_fx
+                clip = resize_fx.resize(clip, width=640, height=480)
+        except Exception as e:
+            print(f"Error resizing clip: {e}")
+    return clip
+
+
+# Background jobs for long-running video work. Job state lives in small JSON
+# files rather than in memory so that any gunicorn worker process can answer
+# a poll for a job started by another one.
+#
+# VIDEO_POOL is the only place video generation/recognition runs in a worker
+# process. Threads rather than processes: jobs use the per-process dataset
+# cache, and the encode itself already runs in a separate ffmpeg process.
+#
+# The pool is per gunicorn worker, so on its own it would allow
+# workers * ASL_VIDEO_WORKERS encodes at once. Encodes therefore also take one
+# of MAX_CONCURRENT_ENCODES slots shared by every process on the machine (see
+# encode_slot), and each encode gets an equal share of the cores.
+VIDEO_POOL_SIZE = int(os.environ.get('ASL_VIDEO_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+VIDEO_POOL = ThreadPoolExecutor(max_workers=VIDEO_POOL_SIZE)
+MAX_CONCURRENT_ENCODES = int(os.environ.get('ASL_MAX_ENCODES', max(1, (os.cpu_count() or 2) // 2)))
+ENCODE_THREADS = int(os.environ.get('ASL_ENCODE_THREADS', max(1, (os.cpu_count() or 1) // MAX_CONCURRENT_ENCODES)))
+ENCODE_OPTIONS = {**VIDEO_WRITE_OPTIONS, 'threads': ENCODE_THREADS}
+# Seconds a synchronous caller waits for a job; keep proxy_read_timeout in
+# nginx.conf.example at least this long
+VIDEO_JOB_TIMEOUT = 300
+# A job still 'running' after this long was lost (e.g. its worker was recycled)
+JOB_STALE_AFTER = 2 * VIDEO_JOB_TIMEOUT
+JOB_FILE_TTL = 60 * 60  # seconds job state files are kept
+_JOB_ID_RE = re.compile(r'[0-9a-f]{32}')
+_last_job_prune = 0.0
+
+
+@contextlib.contextmanager
+def encode_slot():
+    """
+    Hold one of the MAX_CONCURRENT_ENCODES encode slots shared across processes.
+    
+    Each slot is a lock file under the jobs folder; flock locks are released
+    by the kernel if a worker dies, so a crashed encode never leaks its slot.
+    Without fcntl (Windows) only the per-process pool limit applies.
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    while True:
+        for slot in range(MAX_CONCURRENT_ENCODES):
+            lock_file = open(os.path.join(app.config['LOCKS_FOLDER'], f'encode-{slot}.lock'), 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            return
+        time.sleep(0.2)
+
+
+def _job_path(job_id):
+    """Get the path of the state file for a job."""
+    return os.path.join(app.config['JOBS_FOLDER'], f'{job_id}.json')
+
+
+def _write_job(job_id, job):
+    """Atomically replace the stored state of a job."""
+    tmp_path = f"{_job_path(job_id)}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, _job_path(job_id))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _job_error(message, status_code=500):
+    """Build the stored state of a failed job."""
+    return {'state': 'error', 'status_code': status_code,
+            'result': {'status': 'error', 'error': message}}
+
+
+def read_job(job_id):
+    """
+    Get the stored state of a job, or None if the id is unknown.
+    
+    A job that has been running for longer than JOB_STALE_AFTER is reported
+    as failed; its worker is gone and it will never finish.
+    """
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return None
+    try:
+        with open(_job_path(job_id), 'r') as f:
+            job = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if job.get('state') == 'running' and time.time() - job.get('started', 0) > JOB_STALE_AFTER:
+        return _job_error('The job was interrupted before it finished. Please try again.')
+    return job
+
+
+def prune_jobs():
+    """Delete job state files older than JOB_FILE_TTL; runs at most once a minute."""
+    global _last_job_prune
+    now = time.time()
+    if now - _last_job_prune < 60:
+        return
+    _last_job_prune = now
+    
+    for entry in os.scandir(app.config['JOBS_FOLDER']):
+        try:
+            if entry.is_file() and now - entry.stat().st_mtime > JOB_FILE_TTL:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _run_job(job_id, func, args):
+    """Run a job function and record its (payload, status code) result."""
+    try:
+        payload, status_code = func(*args)
+    except Exception as e:
+        print(f"Error in job {job_id}: {e}")
+        payload, status_code = {'status': 'error', 'error': f'Error processing request: {str(e)}'}, 500
+    state = 'done' if status_code < 400 else 'error'
+    try:
+        _write_job(job_id, {'state': state, 'status_code': status_code, 'result': payload})
+    except Exception as e:
+        # e.g. disk full or a payload that can't be serialized; record the
+        # failure so pollers don't wait on a job that looks like it's running
+        print(f"Error storing result of job {job_id}: {e}")
+        try:
+            _write_job(job_id, _job_error(f'Error storing job result: {str(e)}'))
+        except Exception as write_err:
+            print(f"Error storing failure of job {job_id}: {write_err}")
+
+
+def submit_job(func, *args, preview=None):
+    """
+    Start func(*args) in the background and return a 202 response with its job id.
+    
+    Fields in preview are included in the 202 response so the client can
+    show partial results (e.g. a video URL) while the job runs.
+    """
+    prune_jobs()
+    job_id = uuid.uuid4().hex
+    _write_job(job_id, {'state': 'running', 'started': time.time()})
+    VIDEO_POOL.submit(_run_job, job_id, func, args)
+    return jsonify({
+        **(preview or {}),
+        'status': 'accepted',
+        'job_id': job_id,
+        'status_url': url_for('api_job_status', job_id=job_id)
+    }), 202
+
+
+# Loaded datasets keyed on (json path, json mtime, videos dir, videos dir mtime)
+_DATASET_CACHE = {}
+_DATASET_LOCK = threading.Lock()
 
 
 def get_dataset():
-    """Get the WLASL dataset."""
+    """
+    Get the WLASL dataset.
+    
+    The dataset is parsed once per process and reused until the JSON file or
+    the videos directory changes on disk.
+    """
     # Check if JSON file and videos directory exist
     if not os.path.exists(DEFAULT_JSON_PATH):
         return None, "WLASL metadata file not found. Please set up the dataset first."
@@ -158,20 +467,34 @@ def get_dataset():
         return None, "WLASL videos directory not found. Please set up the dataset first."
     
     try:
-        # Print paths for debugging
-        print(f"Using JSON file: {DEFAULT_JSON_PATH}")
-        print(f"Using videos directory: {DEFAULT_VIDEOS_DIR}")
+        cache_key = (DEFAULT_JSON_PATH, os.stat(DEFAULT_JSON_PATH).st_mtime,
+                     DEFAULT_VIDEOS_DIR, os.stat(DEFAULT_VIDEOS_DIR).st_mtime)
+        dataset = _DATASET_CACHE.get(cache_key)
+        if dataset is not None:
+            return dataset, None
         
-        # Initialize dataset
-        dataset = WLASLDataset(DEFAULT_JSON_PATH, DEFAULT_VIDEOS_DIR)
-        
-        # Verify we have at least some videos
-        available_words = dataset.get_available_words()
-        if not available_words:
-            return None, "No videos found in the dataset. Please check the videos directory."
+        # Only one thread parses the dataset; others wait and reuse it
+        with _DATASET_LOCK:
+            dataset = _DATASET_CACHE.get(cache_key)
+            if dataset is not None:
+                return dataset, None
+            
+            # Print paths for debugging
+            print(f"Using JSON file: {DEFAULT_JSON_PATH}")
+            print(f"Using videos directory: {DEFAULT_VIDEOS_DIR}")
             
-        print(f"Dataset loaded successfully with {len(available_words)} available words")
-        return dataset, None
+            # Initialize dataset
+            dataset = WLASLDataset(DEFAULT_JSON_PATH, DEFAULT_VIDEOS_DIR)
+            
+            # Verify we have at least some videos
+            available_words = dataset.get_available_words()
+            if not available_words:
+                return None, "No videos found in the dataset. Please check the videos directory."
+            
+            print(f"Dataset loaded successfully with {len(available_words)} available words")
+            _DATASET_CACHE.clear()
+            _DATASET_CACHE[cache_key] = dataset
+            return dataset, None
     except Exception as e:
         print(f"Error loading dataset: {e}")
         return None, f"Error loading WLASL dataset: {str(e)}"
@@ -196,208 +519,265 @@ def index():
                           has_asl_alphabet_model=asl_alphabet_available)
 
 
-@app.route('/api/text-to-video', methods=['POST'])
-def api_text_to_video():
-    """API endpoint for text to video conversion."""
-    if 'text' not in request.form:
-        return jsonify({'error': 'No text provided'}), 400
-    
-    text = request.form['text']
+def _generation_key(text, include_transitions, resize_videos):
+    """
+    Get the cache key naming the generated video for a text-to-video request.
     
-    # Get the dataset
-    dataset, error = get_dataset()
-    if error:
-        return jsonify({'error': error}), 500
-    
-    # Generate a unique filename for the output video
-    output_filename = f"asl_{uuid.uuid4().hex}.mp4"
-    output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-    
-    # Convert text to video
+    The video only depends on the text, the clip options and the dataset, so
+    the key covers the dataset files' mtimes along with the request options;
+    re-glossed videos get a fresh file instead of a stored one.
+    """
     try:
-        # Get options from the request
-        include_transitions = request.form.get('transitions', 'true') == 'true'
-        resize_videos = request.form.get('resize', 'true') == 'true'
-        detect_homonyms = request.form.get('detect_homonyms', 'true') == 'true'
-        
-        # Convert text to gloss
-        glossed_text = text_to_gloss(text)
-        
-        # Handle homonym detection if enabled
-        homonym_meanings = {}
-        if detect_homonyms:
-            try:
-                # Check if API key is set
-                openai_api_key = os.environ.get("OPENAI_API_KEY", "")
-                if not openai_api_key:
-                    homonym_meanings = {"raw_response": "No OpenAI API key set. Please set it on the Setup page."}
-                    print("No OpenAI API key set")
-                elif openai_api_key == "your-api-key-here":
-                    homonym_meanings = {"raw_response": "Please replace the placeholder API key with your actual OpenAI API key."}
-                    print("API key is still the placeholder value")
-                else:
-                    print(f"Using OpenAI API for homonym detection with text: '{text}'")
-                    from text_to_video import detect_homonyms
-                    homonym_meanings = detect_homonyms(text, glossed_text)
+        dataset_state = f"{os.path.getmtime(DEFAULT_JSON_PATH)}|{os.path.getmtime(DEFAULT_VIDEOS_DIR)}"
+    except OSError:
+        dataset_state = ""
+    return hashlib.blake2b(
+        f"{text}|{include_transitions}|{resize_videos}|{dataset_state}".encode(),
+        digest_size=16
+    ).hexdigest()
+
+
+def _homonyms_need_api(detect_homonyms):
+    """Check whether homonym detection will call the OpenAI API."""
+    openai_api_key = os.environ.get("OPENAI_API_KEY", "")
+    return detect_homonyms and bool(openai_api_key) and openai_api_key != "your-api-key-here"
+
+
+def get_homonym_meanings(text, glossed_text, detect_homonyms):
+    """
+    Get the homonym meanings shown next to a generated video.
+    
+    They depend on the current API key, so they are worked out for every
+    request rather than stored with the video.
+    """
+    homonym_meanings = {}
+    if detect_homonyms:
+        try:
+            # Check if API key is set
+            openai_api_key = os.environ.get("OPENAI_API_KEY", "")
+            if not openai_api_key:
+                homonym_meanings = {"raw_response": "No OpenAI API key set. Please set it on the Setup page."}
+                print("No OpenAI API key set")
+            elif openai_api_key == "your-api-key-here":
+                homonym_meanings = {"raw_response": "Please replace the placeholder API key with your actual OpenAI API key."}
+                print("API key is still the placeholder value")
+            else:
+                print(f"Using OpenAI API for homonym detection with text: '{text}'")
+                from text_to_video import detect_homonyms
+                homonym_meanings = detect_homonyms(text, glossed_text)
+            
+            # If no OpenAI API key, provide sample homonyms for demo purposes
+            if not homonym_meanings:
+                # Find which context tokens occur in the text with a single scan
+                present = set(DEMO_CONTEXT_RE.findall(text.lower()))
+                found_homonyms = [word.lower() for word in glossed_text
+                                  if word.lower() in DEMO_HOMONYM_RULES]
                 
-                # If no OpenAI API key, provide sample homonyms for demo purposes
-                if not homonym_meanings:
-                    # Process all possible homonyms in the text
-                    homonym_list = ["bank", "bat", "bear", "bow", "light", "star", "tie", "saw", "ring", "kind", "fair", "present", "rock", "spring", "letter"]
+                # Only proceed if we found some homonyms
+                if found_homonyms:
+                    print(f"Found homonyms in demo mode: {found_homonyms}")
                     
-                    # Keep track of which homonyms were found
-                    found_homonyms = []
+                    # Pick the meaning based on whether any context token was seen
+                    for word_lower in found_homonyms:
+                        context, meaning, default = DEMO_HOMONYM_RULES[word_lower]
+                        homonym_meanings[word_lower] = meaning if present & context else default
                     
-                    # Check for common homonyms for demo purposes
-                    for word in glossed_text:
-                        word_lower = word.lower()
-                        if word_lower in homonym_list:
-                            found_homonyms.append(word_lower)
-                            
-                    # Only proceed if we found some homonyms
-                    if found_homonyms:
-                        print(f"Found homonyms in demo mode: {found_homonyms}")
-                        
-                        # Process each found homonym
-                        for word_lower in found_homonyms:
-                            if word_lower == "bank":
-                                homonym_meanings[word_lower] = "financial institution" if "money" in text.lower() else "river edge"
-                            elif word_lower == "bat":
-                                homonym_meanings[word_lower] = "animal" if "fly" in text.lower() else "baseball equipment"
-                            elif word_lower == "bow":
-                                homonym_meanings[word_lower] = "bend forward" if "respect" in text.lower() else "tie ribbon"
-                            elif word_lower == "light":
-                                homonym_meanings[word_lower] = "not heavy" if "weight" in text.lower() else "illumination"
-                            elif word_lower == "star":
-                                homonym_meanings[word_lower] = "celestial body" if "sky" in text.lower() else "celebrity"
-                            elif word_lower == "tie":
-                                homonym_meanings[word_lower] = "neck accessory" if "shirt" in text.lower() else "to fasten"
-                            elif word_lower == "saw":
-                                homonym_meanings[word_lower] = "cutting tool" if "wood" in text.lower() else "past tense of see"
-                            elif word_lower == "ring":
-                                homonym_meanings[word_lower] = "jewelry" if "finger" in text.lower() else "sound"
-                            elif word_lower == "present":
-                                homonym_meanings[word_lower] = "gift" if "birthday" in text.lower() else "current time"
-                            elif word_lower == "spring":
-                                homonym_meanings[word_lower] = "season" if "summer" in text.lower() or "winter" in text.lower() else "coil"
-                            elif word_lower == "rock":
-                                homonym_meanings[word_lower] = "stone" if "hard" in text.lower() or "ground" in text.lower() else "music genre"
-                            elif word_lower == "fair":
-                                homonym_meanings[word_lower] = "just" if "equal" in text.lower() or "justice" in text.lower() else "carnival"
-                            elif word_lower == "kind":
-                                homonym_meanings[word_lower] = "nice" if "gentle" in text.lower() or "good" in text.lower() else "type"
-                            elif word_lower == "letter":
-                                homonym_meanings[word_lower] = "mail" if "post" in text.lower() or "send" in text.lower() else "alphabet character"
-                        
-                    # Ensure all values are strings
-                    for key in list(homonym_meanings.keys()):
-                        if not isinstance(homonym_meanings[key], str):
-                            homonym_meanings[key] = str(homonym_meanings[key])
-                
-                if homonym_meanings:
-                    print(f"Detected homonyms with meanings: {homonym_meanings}")
-            except Exception as e:
-                print(f"Error in homonym detection: {e}")
-        
-        # Find videos for each word
-        video_paths = []
-        missing_words = []
-        
-        for word in glossed_text:
-            video_filename = dataset.get_video_for_word(word)
-            if video_filename:
-                video_path = dataset.get_video_path(video_filename)
-                if os.path.exists(video_path):
-                    video_paths.append(video_path)
-                    print(f"Found video for '{word}': {video_filename}")
-                else:
-                    missing_words.append(word)
-                    print(f"Video file not found: {video_path}")
-            else:
-                missing_words.append(word)
-                print(f"No video found for '{word}'")
-        
-        if not video_paths:
-            return jsonify({
+                # Ensure all values are strings
+                for key in list(homonym_meanings.keys()):
+                    if not isinstance(homonym_meanings[key], str):
+                        homonym_meanings[key] = str(homonym_meanings[key])
+            
+            if homonym_meanings:
+                print(f"Detected homonyms with meanings: {homonym_meanings}")
+        except Exception as e:
+            print(f"Error in homonym detection: {e}")
+    
+    # Ensure homonym_meanings is included even if empty
+    if not homonym_meanings:
+        homonym_meanings = {"raw_response": "Error: No response received from OpenAI API. Make sure your API key is valid and has sufficient credits."}
+    return homonym_meanings
+
+
+def text_to_video_job(text, dataset, output_filename, video_url,
+                      include_transitions, resize_videos, detect_homonyms):
+    """
+    Generate an ASL video for text, reusing the video file if it already exists.
+    
+    Runs outside the request context, so it returns a (payload, status code)
+    pair instead of a Flask response.
+    """
+    output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+    
+    # Convert text to gloss
+    glossed_text = text_to_gloss(text)
+    homonym_meanings = get_homonym_meanings(text, glossed_text, detect_homonyms)
+    
+    # Find videos for each word
+    video_paths = []
+    missing_words = []
+    
+    for word in glossed_text:
+        # Existence is checked against the directory listing taken when
+        # the dataset was loaded, so this is a dict/set hit per word
+        video_filename = dataset.get_video_for_word(word)
+        if video_filename and video_filename in dataset.available_videos:
+            video_paths.append(os.path.join(DEFAULT_VIDEOS_DIR, video_filename))
+            print(f"Found video for '{word}': {video_filename}")
+        else:
+            missing_words.append(word)
+            print(f"No video found for '{word}'")
+    
+    if not video_paths:
+        return {
+            'status': 'error',
+            'error': f'No videos found for any words in: {text}',
+            'glossed_text': glossed_text,
+            'missing_words': missing_words
+        }, 400
+    
+    if not os.path.exists(output_path):
+        error = _write_text_video(video_paths, output_path, include_transitions, resize_videos)
+        if error:
+            return {
                 'status': 'error',
-                'error': f'No videos found for any words in: {text}',
+                'error': f'Error creating video: {error}',
                 'glossed_text': glossed_text,
                 'missing_words': missing_words
-            }), 400
-        
-        # Create clips from video paths
-        clips = []
-        for path in video_paths:
-            clip = VideoFileClip(path)
-            if resize_videos:
-                try:
-                    # Different versions of MoviePy have different resize APIs
-                    if hasattr(clip, 'resize_width'):
-                        clip = clip.resize_width(640)
-                    elif hasattr(clip, 'resize'):
-                        clip = clip.resize((640, 480))
-                    elif hasattr(clip, 'resize_height'):
-                        clip = clip.resize_height(480)
-                    else:
-                        # Last resort - use the clip's fx method
-                        from moviepy.video.fx import resize
-                        clip = resize.resize(clip, width=640, height=480)
-                except Exception as e:
-                    print(f"Error resizing clip: {e}")
-            clips.append(clip)
-        
-        # Concatenate clips
-        try:
+            }, 500
+    
+    return {
+        'status': 'success',
+        'video_url': video_url,
+        'glossed_text': glossed_text,
+        'homonym_meanings': homonym_meanings,
+        'missing_words': missing_words
+    }, 200
+
+
+def _write_text_video(video_paths, output_path, include_transitions, resize_videos):
+    """Stitch and encode the clips into output_path; returns an error message or None."""
+    # Write under a temporary name and move it into place, so identical
+    # concurrent requests never serve a half-written file
+    output_dir, output_filename = os.path.split(output_path)
+    tmp_path = os.path.join(output_dir, f".{uuid.uuid4().hex}_{output_filename}")
+    
+    # Each distinct file is opened once per request; repeated words reuse
+    # its clip, and every reader is closed when the request is done
+    unique_clips = {}
+    final_clip = None
+    try:
+        with encode_slot():
+            for path in video_paths:
+                if path not in unique_clips:
+                    unique_clips[path] = _load_clip(path, resize_videos)
+            clips = [unique_clips[path] for path in video_paths]
+            
+            # Concatenate clips
             if include_transitions and len(clips) > 1:
                 final_clip = concatenate_videoclips(clips, method="compose")
             else:
                 final_clip = concatenate_videoclips(clips, method="chain")
             
             # Write the video
-            final_clip.write_videofile(output_path, codec="libx264", audio=False)
-            
-            # Clean up
-            for clip in clips:
-                clip.close()
+            final_clip.write_videofile(tmp_path, **ENCODE_OPTIONS)
+        os.replace(tmp_path, output_path)
+        return None
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return str(e)
+    finally:
+        # Clean up
+        if final_clip is not None:
             final_clip.close()
-            
-            # Homonym meanings were already detected earlier
-            
-            # Ensure homonym_meanings is included even if empty
-            if not homonym_meanings:
-                homonym_meanings = {"raw_response": "Error: No response received from OpenAI API. Make sure your API key is valid and has sufficient credits."}
-                
-            # Return success response
-            return jsonify({
-                'status': 'success',
-                'video_url': url_for('static', filename=f'generated/{output_filename}'),
-                'glossed_text': glossed_text,
-                'homonym_meanings': homonym_meanings,
-                'missing_words': missing_words
-            })
-            
+        for clip in unique_clips.values():
+            clip.close()
+
+
+@app.route('/api/text-to-video', methods=['POST'])
+def api_text_to_video():
+    """
+    API endpoint for text to video conversion.
+    
+    Responds 202 with a job id; poll /api/job/<job_id> for the result. If the
+    video for this text and these options already exists, it is reused and
+    the result is returned directly unless homonym detection needs the API.
+    """
+    if 'text' not in request.form:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    text = request.form['text']
+    
+    # Get the dataset
+    dataset, error = get_dataset()
+    if error:
+        return jsonify({'error': error}), 500
+    
+    # Get options from the request
+    include_transitions = request.form.get('transitions', 'true') == 'true'
+    resize_videos = request.form.get('resize', 'true') == 'true'
+    detect_homonyms = request.form.get('detect_homonyms', 'true') == 'true'
+    
+    output_filename = f"asl_{_generation_key(text, include_transitions, resize_videos)}.mp4"
+    video_url = url_for('static', filename=f'generated/{output_filename}')
+    use_x_accel = app.config['USE_X_ACCEL'] and request.headers.get('X-Use-Xaccel') == '1'
+    
+    job_args = (
+        text, dataset, output_filename, video_url,
+        include_transitions, resize_videos, detect_homonyms,
+    )
+    
+    # Reuse a previously generated video if there is one
+    if os.path.exists(os.path.join(app.config['OUTPUT_FOLDER'], output_filename)):
+        if use_x_accel:
+            return x_accel_response(app.config['X_ACCEL_PREFIX'] + f'generated/{output_filename}')
+        if not _homonyms_need_api(detect_homonyms):
+            payload, status_code = text_to_video_job(*job_args)
+            return jsonify(payload), status_code
+    
+    # Nginx can only send the file once it exists, so X-Accel clients wait
+    if use_x_accel:
+        try:
+            payload, status_code = VIDEO_POOL.submit(text_to_video_job, *job_args).result(timeout=VIDEO_JOB_TIMEOUT)
         except Exception as e:
-            # Clean up any open clips
-            for clip in clips:
-                try:
-                    clip.close()
-                except:
-                    pass
-            
-            return jsonify({
-                'status': 'error',
-                'error': f'Error creating video: {str(e)}',
-                'glossed_text': glossed_text,
-                'missing_words': missing_words
-            }), 500
+            return jsonify({'error': f'Error creating ASL video: {str(e)}'}), 500
+        if status_code != 200:
+            return jsonify(payload), status_code
+        return x_accel_response(app.config['X_ACCEL_PREFIX'] + f'generated/{output_filename}')
     
-    except Exception as e:
-        return jsonify({'error': f'Error creating ASL video: {str(e)}'}), 500
+    return submit_job(text_to_video_job, *job_args)
+
+
+def video_to_text_job(file_path, dataset, top_k):
+    """
+    Recognize signs from an uploaded video; returns (payload, status code).
+    
+    The upload is only needed for the recognition, so it is deleted afterwards.
+    """
+    try:
+        predictions = recognize_signs_from_video(
+            file_path,
+            dataset,
+            DEFAULT_MODEL_PATH,
+            top_k
+        )
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    
+    return {
+        'status': 'success',
+        'predictions': [{'word': word, 'confidence': float(confidence)} for word, confidence in predictions]
+    }, 200
 
 
 @app.route('/api/video-to-text', methods=['POST'])
 def api_video_to_text():
-    """API endpoint for video to text conversion."""
+    """
+    API endpoint for video to text conversion.
+    
+    Saves the upload, then responds 202 with a job id for the recognition.
+    """
     # Check if a file was uploaded
     if 'video' not in request.files:
         return jsonify({'error': 'No video file provided'}), 400
@@ -419,34 +799,98 @@ def api_video_to_text():
     
     try:
         # Save the uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_path = upload_path(file.filename)
         file.save(file_path)
         
         # Get the number of top predictions to return
         top_k = int(request.form.get('top_k', 5))
+    
+    except Exception as e:
+        return jsonify({'error': f'Error recognizing signs: {str(e)}'}), 500
+    
+    return submit_job(video_to_text_job, file_path, dataset, top_k)
+
+
+@app.route('/api/video-to-text/stream', methods=['POST'])
+def api_video_to_text_stream():
+    """
+    API endpoint for video to text conversion from a raw upload.
+    
+    The request body is the video itself (application/octet-stream) with the
+    original filename in the X-Filename header and top_k as a query
+    parameter. The body is copied to disk in 1MB chunks, skipping multipart
+    parsing and spooling. Responds 202 with a job id like /api/video-to-text.
+    """
+    original_filename = unquote(request.headers.get('X-Filename', ''))
+    if not original_filename:
+        return jsonify({'error': 'No filename provided in X-Filename header'}), 400
+    
+    # Check if the file has an allowed extension
+    if not allowed_file(original_filename):
+        return jsonify({'error': 'Invalid file type. Allowed types: mp4, avi, mov, webm'}), 400
+    
+    # Enforce the upload limit ourselves since the body bypasses form parsing
+    if not request.content_length:
+        return jsonify({'error': 'Empty upload'}), 400
+    if request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': 'File too large'}), 413
+    
+    # Get the dataset
+    dataset, error = get_dataset()
+    if error:
+        return jsonify({'error': error}), 500
+    
+    file_path = None
+    try:
+        # Stream the request body straight to the upload folder
+        file_path = upload_path(original_filename)
+        with open(file_path, 'wb') as f:
+            shutil.copyfileobj(request.stream, f, length=1024 * 1024)
+            received = f.tell()
         
-        # Recognize signs from the video
-        predictions = recognize_signs_from_video(
-            file_path,
-            dataset,
-            DEFAULT_MODEL_PATH,
-            top_k
-        )
+        # A client that disconnects mid-upload leaves a short body, not an error
+        if received != request.content_length:
+            os.remove(file_path)
+            return jsonify({'error': 'Incomplete upload'}), 400
         
-        # Return success response
-        return jsonify({
-            'status': 'success',
-            'predictions': [{'word': word, 'confidence': float(confidence)} for word, confidence in predictions]
-        })
+        # Get the number of top predictions to return
+        top_k = int(request.args.get('top_k', 5))
     
     except Exception as e:
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
         return jsonify({'error': f'Error recognizing signs: {str(e)}'}), 500
+    
+    return submit_job(video_to_text_job, file_path, dataset, top_k)
+
+
+def random_video_job(word, video_path, video_url, dataset, top_k):
+    """Recognize signs in a random dataset video; returns (payload, status code)."""
+    # Dataset videos come up again, so keep their decoded frames on disk
+    predictions = recognize_signs_from_video(
+        video_path,
+        dataset,
+        DEFAULT_MODEL_PATH,
+        top_k,
+        use_cache=True
+    )
+    
+    return {
+        'status': 'success',
+        'word': word,
+        'video_url': video_url,
+        'predictions': [{'word': w, 'confidence': float(confidence)} for w, confidence in predictions]
+    }, 200
 
 
 @app.route('/api/random-video', methods=['POST'])
 def api_random_video():
-    """API endpoint for getting a random video."""
+    """
+    API endpoint for getting a random video.
+    
+    With recognize=true the recognition runs as a job and the endpoint
+    responds 202 with a job id; otherwise the result is returned directly.
+    """
     # Get the dataset
     dataset, error = get_dataset()
     if error:
@@ -457,42 +901,109 @@ def api_random_video():
         word, video_filename = dataset.get_random_video()
         video_path = dataset.get_video_path(video_filename)
         
-        # Copy the video to the output folder
-        output_filename = f"random_{uuid.uuid4().hex}.mp4"
-        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-        
-        # Use ffmpeg to copy the video (allows conversion if needed)
-        os.system(f"ffmpeg -i '{video_path}' -c copy '{output_path}' -y >/dev/null 2>&1")
+        # Serve the dataset file in place rather than copying it
+        video_url = url_for('serve_video', filename=video_filename)
         
         # Check if the model exists
         recognize = request.form.get('recognize', 'false') == 'true'
-        predictions = []
         
         if recognize:
             # Get the number of top predictions to return
             top_k = int(request.form.get('top_k', 5))
-            
-            # Recognize signs from the video
-            predictions = recognize_signs_from_video(
-                video_path,
-                dataset,
-                DEFAULT_MODEL_PATH,
-                top_k
-            )
-            predictions = [{'word': word, 'confidence': float(confidence)} for word, confidence in predictions]
+            # The video can play while recognition runs
+            return submit_job(random_video_job, word, video_path, video_url, dataset, top_k,
+                              preview={'word': word, 'video_url': video_url})
         
         # Return success response
         return jsonify({
             'status': 'success',
             'word': word,
-            'video_url': url_for('static', filename=f'generated/{output_filename}'),
-            'predictions': predictions
+            'video_url': video_url,
+            'predictions': []
         })
     
     except Exception as e:
         return jsonify({'error': f'Error getting random video: {str(e)}'}), 500
 
 
+@app.route('/videos/<path:filename>')
+def serve_video(filename):
+    """
+    Serve videos from the dataset videos directory.
+    
+    Behind Nginx the transfer is handed off via X-Accel-Redirect; otherwise
+    the file is sent with conditional/range support so seeking does not
+    re-send the whole video.
+    """
+    if app.config['USE_X_ACCEL']:
+        video_path = safe_join(DEFAULT_VIDEOS_DIR, filename)
+        if video_path is None or not os.path.isfile(video_path):
+            abort(404)
+        return x_accel_response(app.config['X_ACCEL_VIDEOS_PREFIX'] + filename)
+    return send_from_directory(DEFAULT_VIDEOS_DIR, filename, conditional=True)
+
+
+@app.route('/api/job/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """
+    API endpoint for polling a background job.
+    
+    Returns the job state ('running', 'done' or 'error'); finished jobs also
+    carry the result payload the endpoint would have returned directly.
+    """
+    job = read_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    return jsonify(job)
+
+
+# Cached model existence check as (checked at, exists)
+_model_exists_cache = (None, False)
+MODEL_CHECK_TTL = 60  # seconds
+
+
+def model_exists():
+    """
+    Check whether the I3D model file exists.
+    
+    The model only appears while the app is being set up, so the result is
+    reused for MODEL_CHECK_TTL seconds instead of stat-ing on every request.
+    """
+    global _model_exists_cache
+    now = time.monotonic()
+    checked_at, exists = _model_exists_cache
+    if checked_at is None or now - checked_at >= MODEL_CHECK_TTL:
+        exists = os.path.exists(DEFAULT_MODEL_PATH)
+        _model_exists_cache = (now, exists)
+    return exists
+
+
+# Cached /api/dataset-info payload as (dataset id, computed at, payload);
+# the tuple is replaced as a whole so concurrent readers never see a mix
+_dataset_info_cache = (None, 0.0, None)
+DATASET_INFO_TTL = 30  # seconds
+
+
+def _dataset_info_payload(dataset):
+    """Build the dataset info payload, reusing it for DATASET_INFO_TTL seconds."""
+    global _dataset_info_cache
+    now = time.monotonic()
+    dataset_id, checked_at, payload = _dataset_info_cache
+    if dataset_id == id(dataset) and now - checked_at < DATASET_INFO_TTL:
+        return payload
+    
+    # Get dataset information
+    available_words = dataset.get_available_words()
+    payload = {
+        'status': 'success',
+        'word_count': len(available_words),
+        'sample_words': available_words[:10],
+        'is_model_available': model_exists()
+    }
+    _dataset_info_cache = (id(dataset), now, payload)
+    return payload
+
+
 @app.route('/api/dataset-info', methods=['GET'])
 def api_dataset_info():
     """API endpoint for getting dataset information."""
@@ -502,17 +1013,8 @@ def api_dataset_info():
         return jsonify({'error': error}), 500
     
     try:
-        # Get dataset information
-        available_words = dataset.get_available_words()
-        sample_words = available_words[:10] if len(available_words) > 10 else available_words
-        
         # Return success response
-        return jsonify({
-            'status': 'success',
-            'word_count': len(available_words),
-            'sample_words': sample_words,
-            'is_model_available': os.path.exists(DEFAULT_MODEL_PATH)
-        })
+        return jsonify(_dataset_info_payload(dataset))
     
     except Exception as e:
         return jsonify({'error': f'Error getting dataset information: {str(e)}'}), 500
@@ -598,30 +1100,51 @@ def api_test_openai():
         }), 500
 
 
+# Cached video count as (directory, directory mtime, count)
+_video_count_cache = (None, None, 0)
+
+
+def count_videos(videos_dir):
+    """
+    Count the video files in a directory.
+    
+    The count is cached and only recomputed when the directory's mtime
+    changes, which happens whenever files are added or removed.
+    """
+    global _video_count_cache
+    mtime = os.stat(videos_dir).st_mtime
+    cached_dir, cached_mtime, count = _video_count_cache
+    if cached_dir == videos_dir and cached_mtime == mtime:
+        return count
+    
+    extensions = ('.mp4', '.avi', '.mov', '.webm')
+    with os.scandir(videos_dir) as entries:
+        count = sum(1 for entry in entries if entry.name.lower().endswith(extensions))
+    _video_count_cache = (videos_dir, mtime, count)
+    return count
+
+
 @app.route('/api/setup-check', methods=['GET'])
 def api_setup_check():
     """API endpoint for checking setup status."""
     # Check if JSON file and videos directory exist
     json_exists = os.path.exists(DEFAULT_JSON_PATH)
     videos_dir_exists = os.path.exists(DEFAULT_VIDEOS_DIR)
-    model_exists = os.path.exists(DEFAULT_MODEL_PATH)
+    model_available = model_exists()
     
     # Check if OpenAI API key is set
     openai_api_key = os.environ.get("OPENAI_API_KEY", "")
     has_api_key = bool(openai_api_key)
     
     # Count videos if directory exists
-    video_count = 0
-    if videos_dir_exists:
-        video_files = [f for f in os.listdir(DEFAULT_VIDEOS_DIR) if f.lower().endswith(('.mp4', '.avi', '.mov', '.webm'))]
-        video_count = len(video_files)
+    video_count = count_videos(DEFAULT_VIDEOS_DIR) if videos_dir_exists else 0
     
     # Return status
     return jsonify({
         'status': 'success',
         'json_exists': json_exists,
         'videos_dir_exists': videos_dir_exists,
-        'model_exists': model_exists,
+        'model_exists': model_available,
         'video_count': video_count,
         'json_path': DEFAULT_JSON_PATH,
         'videos_dir': DEFAULT_VIDEOS_DIR,
@@ -721,5 +1244,32 @@ def api_asl_alphabet_predict():
         return jsonify({'error': str(e)})
 
 
+def warm_up():
+    """Load the dataset and recognition model ahead of the first request."""
+    dataset, error = get_dataset()
+    if error:
+        print(f"Skipping warm-up: {error}")
+        return
+    get_predictor(DEFAULT_MODEL_PATH)
+    print("Dataset and recognition model loaded")
+
+
+# Warm up in the background so importing the app (e.g. in a gunicorn worker)
+# isn't blocked; a request arriving meanwhile waits on the same dataset lock
+VIDEO_POOL.submit(warm_up)
+
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
+    # Production deployments run under gunicorn (see gunicorn_conf.py);
+    # the Werkzeug server below is for local development only
+    if os.environ.get('ASL_ENV') == 'production':
+        print("ASL_ENV=production: start the app with gunicorn instead:")
+        print("  gunicorn -c gunicorn_conf.py app:app")
+        sys.exit(1)
+    
+    # The reloader would re-import this module and reload the model on every
+    # code change, so it stays off even when the debugger is enabled
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    print("Development server; for production use:")
+    print("  gunicorn -w $(nproc) -k gthread --threads 8 app:app -b 0.0.0.0:8080")
+    app.run(debug=debug, use_reloader=False, host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the ASL WLASL Converter web application.
+
+Run from the webapp directory with:
+    gunicorn -c gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('ASL_BIND', '0.0.0.0:8080')
+
+# Worker processes handle requests in parallel across cores; threads within
+# each worker overlap uploads, ffmpeg waits and API calls
+workers = int(os.environ.get('ASL_WORKERS', 2 * multiprocessing.cpu_count() + 1))
+worker_class = os.environ.get('ASL_WORKER_CLASS', 'gthread')
+threads = 8
+
+# Under gevent or eventlet the video job pool would run as greenlets, and
+# MoviePy compositing and torch inference never yield: they would block job
+# polls and the worker heartbeat until gunicorn killed the worker mid-encode
+if 'gevent' in worker_class or 'eventlet' in worker_class:
+    raise RuntimeError(
+        f"ASL_WORKER_CLASS={worker_class} is not supported: video jobs are CPU-bound "
+        "and would block the event loop; use gthread (the default) or sync"
+    )
+
+# Video generation can take a while, so allow long requests
+timeout = 120
+
+# Recycle workers periodically to bound memory growth from what each worker
+# keeps loaded: the parsed dataset, the recognition model and the probe caches
+max_requests = 1000
+max_requests_jitter = 50
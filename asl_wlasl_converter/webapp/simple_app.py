@@ -5,14 +5,58 @@ A basic version of the web interface that doesn't rely on moviepy for video proc
 """
 
 import os
+import re
 import sys
+import uuid
+import random
 import json
-from flask import Flask, render_template, request, jsonify, send_from_directory, url_for
+import functools
+import itertools
+import mimetypes
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, abort, render_template, request, jsonify, send_from_directory, url_for
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path to import modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+try:
+    from asl_gloss_converter import convert_to_asl_gloss
+except ImportError:
+    convert_to_asl_gloss = None
+
+# MoviePy is only needed when clips can't be joined with FFmpeg directly
+try:
+    from moviepy.editor import VideoFileClip, concatenate_videoclips
+except ImportError:
+    try:
+        from moviepy import VideoFileClip, concatenate_videoclips
+    except ImportError:
+        VideoFileClip = concatenate_videoclips = None
+
+try:
+    from text_to_video import VIDEO_WRITE_OPTIONS
+except ImportError:
+    VIDEO_WRITE_OPTIONS = None
+
+# OpenCV is only needed to read uploaded videos
+try:
+    import cv2
+except ImportError:
+    cv2 = None
 
 # Create app
 app = Flask(__name__)
@@ -20,15 +64,29 @@ app = Flask(__name__)
 # Configuration
 app.config['UPLOAD_FOLDER'] = os.path.join(current_dir, 'static', 'uploads')
 app.config['OUTPUT_FOLDER'] = os.path.join(current_dir, 'static', 'generated')
+app.config['NORMALIZED_FOLDER'] = os.path.join(current_dir, 'static', 'normalized')
 app.config['ALLOWED_EXTENSIONS'] = {'mp4', 'avi', 'mov', 'webm'}
+# Behind Nginx, hand video transfers off with X-Accel-Redirect (see nginx.conf.example)
+app.config['USE_X_ACCEL'] = os.environ.get('ASL_USE_X_ACCEL') == '1'
+app.config['X_ACCEL_VIDEOS_PREFIX'] = '/internal-videos/'
+# Under Apache mod_xsendfile, let send_from_directory emit X-Sendfile instead
+app.use_x_sendfile = os.environ.get('ASL_USE_X_SENDFILE') == '1'
 
 # Create directories if they don't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
+os.makedirs(app.config['NORMALIZED_FOLDER'], exist_ok=True)
 
-# Constants - use the archive-3 directory directly
-DEFAULT_JSON_PATH = '/Users/yuvan/Documents/Code/AI_testing/claudeCode/MiniProject/archive-3/WLASL_v0.3.json'
-DEFAULT_VIDEOS_DIR = '/Users/yuvan/Documents/Code/AI_testing/claudeCode/MiniProject/archive-3/videos'
+# Constants - WLASL_JSON_PATH / WLASL_VIDEOS_DIR (see .env.example) override
+# the archive-3 directory
+DEFAULT_JSON_PATH = os.environ.get(
+    'WLASL_JSON_PATH',
+    '/Users/yuvan/Documents/Code/AI_testing/claudeCode/MiniProject/archive-3/WLASL_v0.3.json'
+)
+DEFAULT_VIDEOS_DIR = os.environ.get(
+    'WLASL_VIDEOS_DIR',
+    '/Users/yuvan/Documents/Code/AI_testing/claudeCode/MiniProject/archive-3/videos'
+)
 
 # Check if paths exist
 if not os.path.exists(DEFAULT_JSON_PATH):
@@ -42,76 +100,256 @@ print(f"Using JSON file: {DEFAULT_JSON_PATH}")
 print(f"Using videos directory: {DEFAULT_VIDEOS_DIR}")
 
 
+# The parsed WLASL JSON, loaded once and shared by every request
+_WLASL_CACHE = None
+_WLASL_LOCK = threading.Lock()
+
+
 def load_wlasl_json():
-    """Load and parse the WLASL JSON file."""
+    """Load and parse the WLASL JSON file, reusing the parsed data after the first call."""
+    global _WLASL_CACHE
+    if _WLASL_CACHE is not None:
+        return _WLASL_CACHE
+    
+    with _WLASL_LOCK:
+        if _WLASL_CACHE is None:
+            try:
+                if orjson is not None:
+                    with open(DEFAULT_JSON_PATH, 'rb') as f:
+                        _WLASL_CACHE = orjson.loads(f.read())
+                else:
+                    with open(DEFAULT_JSON_PATH, 'r') as f:
+                        _WLASL_CACHE = json.load(f)
+            except Exception as e:
+                # Leave the cache empty so a later call can retry
+                print(f"Error loading WLASL JSON: {e}")
+                return None
+    return _WLASL_CACHE
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.webm')
+
+# Names of the files in the videos directory, video_id -> path of its file,
+# and word -> path of its first available video
+VIDEO_SET = frozenset()
+VIDEO_FILES = {}
+WORD_TO_VIDEO = {}
+
+
+def scan_video_set():
+    """Get the names of all files in the videos directory with one directory scan."""
+    if not os.path.isdir(DEFAULT_VIDEOS_DIR):
+        return frozenset()
+    return frozenset(entry.name for entry in os.scandir(DEFAULT_VIDEOS_DIR) if entry.is_file())
+
+
+def map_video_files(video_set):
+    """Map each video_id to its file path, preferring extensions in VIDEO_EXTENSIONS order."""
+    best = {}
+    for name in video_set:
+        video_id, ext = os.path.splitext(name)
+        if ext in VIDEO_EXTENSIONS:
+            rank = VIDEO_EXTENSIONS.index(ext)
+            if video_id not in best or rank < best[video_id][0]:
+                best[video_id] = (rank, name)
+    return {video_id: os.path.join(DEFAULT_VIDEOS_DIR, name) for video_id, (_, name) in best.items()}
+
+
+def find_video_for_entry(entry):
+    """Get the path of the first instance video available for a WLASL entry."""
+    for instance in entry.get('instances') or ():
+        video_path = VIDEO_FILES.get(instance.get('video_id'))
+        if video_path:
+            return video_path
+    return None
+
+
+# Progress of the background index build, read by the word-list progress stream
+BUILD_PROGRESS = {'done': 0, 'total': 0}
+INDEX_READY = threading.Event()
+_INDEX_LOCK = threading.Lock()
+# Held while a background rebuild is queued or running, so only one starts
+_REBUILD_LOCK = threading.Lock()
+
+# Words with videos in dataset order, and the file mtimes the index was built from
+AVAILABLE_WORDS = []
+_INDEX_KEY = None
+
+
+def _index_key():
+    """Get the modification times that invalidate the word index."""
     try:
-        with open(DEFAULT_JSON_PATH, 'r') as f:
-            data = json.load(f)
-        return data
-    except Exception as e:
-        print(f"Error loading WLASL JSON: {e}")
+        return os.path.getmtime(DEFAULT_JSON_PATH), os.path.getmtime(DEFAULT_VIDEOS_DIR)
+    except OSError:
         return None
 
 
-def get_available_words():
-    """Get a list of available words that have video files in the dataset."""
-    data = load_wlasl_json()
-    if not data:
-        return []
+def build_word_index():
+    """Build the video_id and word lookups used by the API endpoints."""
+    global VIDEO_SET, VIDEO_FILES, WORD_TO_VIDEO, AVAILABLE_WORDS, _INDEX_KEY
     
-    available_words = []
-    for entry in data:
-        word = entry['gloss'].lower()
-        # Check if there's at least one video available for this word
-        if has_video_for_word(entry):
-            available_words.append(word)
+    index_key = _index_key()
+    try:
+        with _INDEX_LOCK:
+            VIDEO_SET = scan_video_set()
+            VIDEO_FILES = map_video_files(VIDEO_SET)
+            
+            entries = load_wlasl_json() or []
+            BUILD_PROGRESS['total'] = len(entries)
+            
+            word_to_video = {}
+            for done, entry in enumerate(entries, 1):
+                word = entry['gloss'].lower()
+                if word not in word_to_video:
+                    video_path = find_video_for_entry(entry)
+                    if video_path:
+                        word_to_video[word] = video_path
+                BUILD_PROGRESS['done'] = done
+            
+            WORD_TO_VIDEO = word_to_video
+            AVAILABLE_WORDS = list(word_to_video)
+            print(f"Indexed {len(WORD_TO_VIDEO)} words with videos ({len(VIDEO_FILES)} video files)")
+    except Exception as e:
+        # Keep serving the previous index; the files are retried once they change again
+        print(f"Error building word index: {e}")
+    finally:
+        _INDEX_KEY = index_key
+        # Release waiting requests even if the build failed; they see the last good (or empty) index
+        INDEX_READY.set()
+
+
+def _rebuild_word_index():
+    """Rebuild the word index if the dataset files still differ from the built one."""
+    global _WLASL_CACHE
     
-    return available_words
+    try:
+        if _index_key() != _INDEX_KEY:
+            print("WLASL JSON or videos directory changed, rebuilding word index")
+            with _WLASL_LOCK:
+                _WLASL_CACHE = None
+            build_word_index()
+    finally:
+        _REBUILD_LOCK.release()
+
+
+def wait_for_index():
+    """
+    Block until the word index is built.
+    
+    If the dataset files changed since, one background rebuild is started and
+    requests keep using the current index until it finishes.
+    """
+    INDEX_READY.wait()
+    if _index_key() != _INDEX_KEY and _REBUILD_LOCK.acquire(blocking=False):
+        threading.Thread(target=_rebuild_word_index, name='word-index-rebuild', daemon=True).start()
+
+
+def iter_available_words():
+    """Yield the available words in dataset order without building a list."""
+    wait_for_index()
+    yield from WORD_TO_VIDEO
+
+
+def get_available_words():
+    """
+    Get a list of available words that have video files in the dataset.
+    
+    The list is shared between requests and must not be modified.
+    """
+    wait_for_index()
+    return AVAILABLE_WORDS
 
 
 def has_video_for_word(entry):
     """Check if the word has at least one video available."""
-    if 'instances' not in entry or not entry['instances']:
-        return False
-        
-    for instance in entry['instances']:
-        if 'video_id' in instance:
-            video_id = instance['video_id']
-            
-            # Try multiple file extensions
-            for ext in ['.mp4', '.avi', '.mov', '.webm']:
-                video_filename = f"{video_id}{ext}"
-                video_path = os.path.join(DEFAULT_VIDEOS_DIR, video_filename)
-                if os.path.exists(video_path):
-                    print(f"Found video for {entry['gloss']}: {video_path}")
-                    return True
-    
-    return False
+    return find_video_for_entry(entry) is not None
 
 
 def get_video_for_word(word):
     """Get a video file path for a given word."""
-    data = load_wlasl_json()
-    if not data:
-        return None
-    
+    wait_for_index()
     word = word.lower()
-    for entry in data:
-        if entry['gloss'].lower() == word and 'instances' in entry and entry['instances']:
-            for instance in entry['instances']:
-                if 'video_id' in instance:
-                    video_id = instance['video_id']
-                    
-                    # Try multiple file extensions
-                    for ext in ['.mp4', '.avi', '.mov', '.webm']:
-                        video_filename = f"{video_id}{ext}"
-                        video_path = os.path.join(DEFAULT_VIDEOS_DIR, video_filename)
-                        if os.path.exists(video_path):
-                            print(f"Found video for word '{word}': {video_path}")
-                            return video_path
-    
-    print(f"No video found for word '{word}'")
-    return None
+    video_path = WORD_TO_VIDEO.get(word)
+    if video_path:
+        print(f"Found video for word '{word}': {video_path}")
+    else:
+        print(f"No video found for word '{word}'")
+    return video_path
+
+
+# Runs of characters that are neither alphanumeric nor whitespace; they are
+# replaced by a space before splitting into words
+_PUNCT_RE = re.compile(r'[^\w\s]+|_+')
+
+# Function words dropped from the gloss
+SKIP_WORDS = frozenset({'a', 'an', 'the', 'is', 'are', 'am', 'was', 'were', 'be', 'been', 'being',
+                        'to', 'of', 'for', 'and', 'or', 'but', 'nor', 'so', 'yet', 'at', 'by',
+                        'in', 'into', 'on', 'onto', 'with', 'within', 'without', 'that', 'which'})
+SIMPLE_SKIP_WORDS = SKIP_WORDS - {'that', 'which'}
+
+# Time-related words (move to beginning in ASL)
+TIME_WORDS = frozenset({'yesterday', 'today', 'tomorrow', 'now', 'later', 'before', 'after',
+                        'morning', 'afternoon', 'evening', 'night', 'week', 'month', 'year'})
+
+# Question words (handled specially in ASL - often at beginning and repeated at end)
+QUESTION_WORDS = frozenset({'what', 'who', 'where', 'when', 'why', 'how', 'which'})
+QUESTION_WORDS_UPPER = frozenset(q.upper() for q in QUESTION_WORDS)
+
+# Negation (typically follows the verb in ASL)
+NEGATION_WORDS = frozenset({'not', 'never', 'none', 'nothing', 'nobody', 'no', 'dont', "don't"})
+
+
+def _strip_plural(word):
+    """For plurals, add a count indicator in ASL; words ending in 'ss' aren't plurals."""
+    if word.endswith('ss'):
+        return word, ""
+    return word[:-1], "MANY"
+
+
+def _strip_progressive(word):
+    """For continuous actions, use the root form."""
+    root_word = word[:-3]
+    # Handle doubling rule (e.g., running -> run)
+    if root_word[-1] == root_word[-2]:
+        root_word = root_word[:-1]
+    return root_word, ""
+
+
+def _strip_past(word):
+    """Past tense - use root + FINISH in ASL."""
+    return word[:-2], "FINISH"
+
+
+# Suffix rules, longest suffix first. Other common endings (-es, -ly, -er,
+# -est) are left on the word.
+SUFFIX_RULES = {
+    'ing': _strip_progressive,
+    'ed': _strip_past,
+    's': _strip_plural,
+}
+SUFFIXES = tuple(SUFFIX_RULES)
+
+
+@functools.lru_cache(maxsize=4096)
+def _strip_suffix(word):
+    """
+    Reduce a word to its root form for matching words in the WLASL dataset.
+    
+    Args:
+        word: Lowercase input word
+        
+    Returns:
+        Tuple of (root, marker), where marker is "MANY" for plurals, "FINISH"
+        for past tense, or "" when no ASL marker is added
+    """
+    # One C-level check rules out most words before looking for the suffix
+    if not word.endswith(SUFFIXES):
+        return word, ""
+    
+    suffix = next((s for s in SUFFIXES if word.endswith(s) and len(word) > len(s) + 1), None)
+    if suffix is None:
+        return word, ""
+    return SUFFIX_RULES[suffix](word)
 
 
 def text_to_gloss(text, use_advanced=True):
@@ -127,34 +365,18 @@ def text_to_gloss(text, use_advanced=True):
     """
     # Use comprehensive converter if requested
     if use_advanced:
-        # Import the comprehensive converter
-        sys.path.append(parent_dir)
-        try:
-            from asl_gloss_converter import convert_to_asl_gloss
+        if convert_to_asl_gloss is not None:
             return convert_to_asl_gloss(text, use_fingerspelling=True, detailed_markers=False)
-        except ImportError:
-            # Fall back to the advanced implementation
-            print("Comprehensive ASL converter not available, using built-in version")
-            return advanced_text_to_gloss(text)
+        # Fall back to the advanced implementation
+        print("Comprehensive ASL converter not available, using built-in version")
+        return advanced_text_to_gloss(text)
     
     # Simple conversion (original implementation)
-    # Simple text preprocessing
-    text = text.lower()
-    
     # Remove punctuation and split into words
-    words = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in text).split()
+    words = _PUNCT_RE.sub(' ', text.lower()).split()
     
     # Filter out common words that might not be needed in ASL
-    skip_words = {'a', 'an', 'the', 'is', 'are', 'am', 'was', 'were', 'be', 'been', 'being', 
-                  'to', 'of', 'for', 'and', 'or', 'but', 'nor', 'so', 'yet', 'at', 'by', 
-                  'in', 'into', 'on', 'onto', 'with', 'within', 'without'}
-    
-    filtered_words = []
-    for word in words:
-        if word not in skip_words:
-            filtered_words.append(word)
-    
-    return filtered_words
+    return [word for word in words if word not in SIMPLE_SKIP_WORDS]
 
 
 def advanced_text_to_gloss(text):
@@ -169,42 +391,23 @@ def advanced_text_to_gloss(text):
         List of words in ASL gloss format
     """
     # Step 1: Preprocessing
-    text = text.lower()
-    text = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in text)
+    text = _PUNCT_RE.sub(' ', text.lower())
     words = text.split()
     
     # Step 2: Part-of-Speech Tagging (simplified)
     # In a real implementation, we would use NLTK or spaCy for POS tagging
-    # Here we use a simplified approach based on common word patterns
-    
-    # Words to skip (function words)
-    skip_words = {'a', 'an', 'the', 'is', 'are', 'am', 'was', 'were', 'be', 'been', 'being', 
-                  'to', 'of', 'for', 'and', 'or', 'but', 'nor', 'so', 'yet', 'at', 'by', 
-                  'in', 'into', 'on', 'onto', 'with', 'within', 'without', 'that', 'which'}
-    
-    # Time-related words (move to beginning in ASL)
-    time_words = {'yesterday', 'today', 'tomorrow', 'now', 'later', 'before', 'after', 
-                  'morning', 'afternoon', 'evening', 'night', 'week', 'month', 'year'}
-    
-    # Question words (handled specially in ASL - often at beginning and repeated at end)
-    question_words = {'what', 'who', 'where', 'when', 'why', 'how', 'which'}
-    
-    # Negation (typically follows the verb in ASL)
-    negation_words = {'not', 'never', 'none', 'nothing', 'nobody', 'no', 'dont', "don't"}
-    
-    # Common suffixes to strip
-    suffixes = ['s', 'es', 'ed', 'ing', 'ly', 'er', 'est']
+    # Here we use a simplified approach based on the word sets defined above
     
     # Step 3: Preprocess words - handle plurals, -ing forms, etc.
     processed_words = []
     
     for word in words:
         # Skip function words
-        if word in skip_words:
+        if word in SKIP_WORDS:
             continue
             
         # Handle negation words
-        if word in negation_words:
+        if word in NEGATION_WORDS:
             processed_words.append("NOT")
             continue
             
@@ -214,69 +417,23 @@ def advanced_text_to_gloss(text):
             continue
             
         # Strip common suffixes to get to root form
-        original_word = word
-        modified = False
-        
-        # Try to find a matching singular form for plurals or to remove suffixes
-        # This helps match words in the WLASL dataset
-        for suffix in suffixes:
-            if word.endswith(suffix) and len(word) > len(suffix) + 1:
-                # Check for special cases
-                if suffix == 's':
-                    # Check for words ending in 'ss' that aren't plurals
-                    if word.endswith('ss'):
-                        continue
-                    
-                    # For plurals, add a count indicator in ASL
-                    root_word = word[:-1]
-                    processed_words.append(root_word.upper())
-                    processed_words.append("MANY")
-                    modified = True
-                    break
-                    
-                elif suffix == 'ing':
-                    # For continuous actions, use root + 'NOW' in some cases
-                    root_word = word[:-3]
-                    # Handle doubling rule (e.g., running -> run)
-                    if len(root_word) > 0 and root_word[-1] == root_word[-2]:
-                        root_word = root_word[:-1]
-                    processed_words.append(root_word.upper())
-                    modified = True
-                    break
-                    
-                elif suffix == 'ed':
-                    # Past tense - use root + FINISH in ASL
-                    root_word = word[:-2]
-                    processed_words.append(root_word.upper())
-                    processed_words.append("FINISH")
-                    modified = True
-                    break
-        
-        # If we didn't modify the word, add it as is
-        if not modified:
-            processed_words.append(original_word.upper())
+        root_word, marker = _strip_suffix(word)
+        processed_words.append(root_word.upper())
+        if marker:
+            processed_words.append(marker)
     
     # Step 4: Apply ASL grammar rules
-    time_marker = None
     topic = []
-    main_clause = processed_words
-    question_marker = None
-    is_question = any(word in [q.upper() for q in question_words] for word in processed_words) or text.endswith('?')
-    
-    # Extract time marker if present (moves to beginning in ASL)
-    for word in processed_words:
-        if word.lower() in time_words:
-            time_marker = word
-            main_clause.remove(word)
-            break
-    
-    # Extract question marker if present
-    for word in processed_words:
-        if word.lower() in question_words:
-            question_marker = word
-            if word in main_clause:
-                main_clause.remove(word)
-            break
+    is_question = any(word in QUESTION_WORDS_UPPER for word in processed_words) or text.endswith('?')
+    
+    # Find the first time marker (moves to beginning in ASL) and question marker
+    time_index = next((i for i, word in enumerate(processed_words) if word.lower() in TIME_WORDS), None)
+    question_index = next((i for i, word in enumerate(processed_words) if word.lower() in QUESTION_WORDS), None)
+    time_marker = processed_words[time_index] if time_index is not None else None
+    question_marker = processed_words[question_index] if question_index is not None else None
+    
+    # Everything else stays in order as the main clause
+    main_clause = [word for i, word in enumerate(processed_words) if i != time_index and i != question_index]
     
     # Construct final gloss with ASL grammar order
     result = []
@@ -302,24 +459,148 @@ def advanced_text_to_gloss(text):
     return result
 
 
-def get_dataset():
-    """Get the WLASL dataset."""
-    if not os.path.exists(DEFAULT_JSON_PATH):
-        return None, f"WLASL metadata file not found: {DEFAULT_JSON_PATH}"
+# FFmpeg tools used to join clips without re-encoding, if they are installed
+FFMPEG_BIN = shutil.which('ffmpeg')
+FFPROBE_BIN = shutil.which('ffprobe')
+
+
+@functools.lru_cache(maxsize=1024)
+def _probe_video_stream(path, mtime_ns, size):
+    """
+    Get the format of a file's video stream.
     
-    if not os.path.exists(DEFAULT_VIDEOS_DIR):
-        return None, f"Videos directory not found: {DEFAULT_VIDEOS_DIR}"
+    Returns (codec, width, height, pixel format, frame rate, sample aspect
+    ratio, profile, time base); clips are only joined by stream copy when
+    all of these match, since any of them differing breaks the concat output.
+    """
+    try:
+        result = subprocess.run(
+            [FFPROBE_BIN, '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries',
+             'stream=codec_name,width,height,pix_fmt,r_frame_rate,sample_aspect_ratio,profile,time_base',
+             '-of', 'json', path],
+            capture_output=True, check=True, timeout=30
+        )
+        stream = json.loads(result.stdout)['streams'][0]
+        return (stream['codec_name'], stream['width'], stream['height'],
+                stream['pix_fmt'], stream['r_frame_rate'], stream.get('sample_aspect_ratio'),
+                stream.get('profile'), stream['time_base'])
+    except (subprocess.SubprocessError, OSError, ValueError, KeyError, IndexError) as e:
+        print(f"Could not probe {path}: {e}")
+        return None
+
+
+def probe_video_stream(path):
+    """Probe a video's stream format, cached until the file changes."""
+    stat = os.stat(path)
+    return _probe_video_stream(path, stat.st_mtime_ns, stat.st_size)
+
+
+def can_stream_copy(video_paths, target_size=None):
+    """Check whether clips can be joined by FFmpeg's concat demuxer without re-encoding."""
+    if not FFMPEG_BIN or not FFPROBE_BIN:
+        return False
+    
+    streams = {probe_video_stream(path) for path in set(video_paths)}
+    if len(streams) != 1 or None in streams:
+        return False
+    
+    codec, width, height = next(iter(streams))[:3]
+    return codec == 'h264' and (target_size is None or (width, height) == tuple(target_size))
+
+
+def concat_with_ffmpeg(video_paths, output_path):
+    """
+    Join clips that share a stream format with FFmpeg's concat demuxer.
+    
+    Args:
+        video_paths: Paths of the clips, in order
+        output_path: Path for the joined video
+        
+    Returns:
+        True if the video was written, False otherwise
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as list_file:
+        for path in video_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
     
     try:
-        # Import at runtime to avoid circular imports
-        sys.path.append(parent_dir)
-        from dataset_utils import WLASLDataset
+        subprocess.run(
+            [FFMPEG_BIN, '-y', '-v', 'error', '-f', 'concat', '-safe', '0',
+             '-i', list_file.name, '-c:v', 'copy', '-an', '-movflags', '+faststart', output_path],
+            capture_output=True, check=True, timeout=120
+        )
+        return True
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"FFmpeg concat failed, falling back to MoviePy: {e}")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return False
+    finally:
+        os.remove(list_file.name)
+
+
+# Every normalized clip gets the same stream format, so any sequence of them
+# can be joined without re-encoding
+NORMALIZED_SIZE = (640, 480)
+NORMALIZED_FPS = 25
+NORMALIZE_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def normalize_clip(video_path):
+    """
+    Get a copy of a source clip scaled to NORMALIZED_SIZE with square pixels, encoding it on first use.
+    
+    Args:
+        video_path: Path to the source video
         
-        # Initialize dataset
-        dataset = WLASLDataset(DEFAULT_JSON_PATH, DEFAULT_VIDEOS_DIR)
-        return dataset, None
-    except Exception as e:
-        return None, f"Error loading WLASL dataset: {str(e)}"
+    Returns:
+        Path of the normalized clip, or None if it could not be created
+    """
+    video_id = os.path.splitext(os.path.basename(video_path))[0]
+    width, height = NORMALIZED_SIZE
+    # Square pixels are part of the name so clips scaled before setsar are not reused
+    cached_path = os.path.join(app.config['NORMALIZED_FOLDER'], f"{video_id}_{width}x{height}_sar1.mp4")
+    
+    # Reuse the cached clip unless the source has been modified since
+    try:
+        if os.path.getmtime(cached_path) >= os.path.getmtime(video_path):
+            return cached_path
+    except OSError:
+        pass
+    
+    # Encode to a temporary name so concurrent requests never read a partial file
+    tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp.mp4"
+    try:
+        subprocess.run(
+            [FFMPEG_BIN, '-y', '-v', 'error', '-i', video_path,
+             '-vf', f'scale={width}:{height},setsar=1', '-r', str(NORMALIZED_FPS),
+             '-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p', '-an', tmp_path],
+            capture_output=True, check=True, timeout=120
+        )
+        os.replace(tmp_path, cached_path)
+        return cached_path
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"Could not normalize {video_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+
+def normalize_clips(video_paths):
+    """Normalize each unique clip once; returns the normalized paths in order, or None."""
+    if not FFMPEG_BIN:
+        return None
+    
+    # Encode the missing clips side by side; the bound keeps a long sentence
+    # from starting one ffmpeg process per word
+    unique_paths = list(dict.fromkeys(video_paths))
+    with ThreadPoolExecutor(max_workers=min(NORMALIZE_WORKERS, len(unique_paths))) as executor:
+        normalized = dict(zip(unique_paths, executor.map(normalize_clip, unique_paths)))
+    if None in normalized.values():
+        return None
+    return [normalized[path] for path in video_paths]
 
 
 def create_sentence_video(words):
@@ -333,6 +614,10 @@ def create_sentence_video(words):
     }
 
 
+# Build the index in the background so the server can start accepting requests
+threading.Thread(target=build_word_index, name='word-index', daemon=True).start()
+
+
 @app.route('/')
 def index():
     """Render the main page."""
@@ -341,19 +626,24 @@ def index():
 
 @app.route('/api/dataset-info', methods=['GET'])
 def api_dataset_info():
-    """API endpoint for getting dataset information."""
+    """
+    API endpoint for getting dataset information.
+    
+    Pass ?include_words=0 to get only the count and sample, without the full word list.
+    """
     try:
-        words = get_available_words()
-        sample_words = words[:10] if len(words) > 10 else words
-        
-        return jsonify({
+        sample_words = list(itertools.islice(iter_available_words(), 10))
+        info = {
             'status': 'success',
-            'word_count': len(words),
+            'word_count': len(WORD_TO_VIDEO),
             'sample_words': sample_words,
-            'all_words': words,  # Return all available words
             'videos_dir': DEFAULT_VIDEOS_DIR,
             'json_path': DEFAULT_JSON_PATH
-        })
+        }
+        if request.args.get('include_words', '1') != '0':
+            info['all_words'] = get_available_words()  # Return all available words
+        
+        return jsonify(info)
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -378,7 +668,8 @@ def api_word_video():
             'message': f'No video found for word: {word}'
         })
     
-    gloss = text_to_gloss(word)
+    # A single word has no grammar to rearrange, so skip the full converter
+    gloss = text_to_gloss(word, use_advanced=len(word.split()) > 1)
     
     return jsonify({
         'status': 'success',
@@ -405,35 +696,24 @@ def api_sentence_video():
         })
     
     try:
-        # Import locally here to prevent circular imports
-        from text_to_video import create_asl_video_from_text
-        
         # Get options from request
         include_transitions = request.json.get('include_transitions', True)
         resize_videos = request.json.get('resize_videos', True)
         
-        # Get the dataset
-        dataset, error = get_dataset()
-        if error:
-            return jsonify({'status': 'error', 'message': error})
-        
         # Convert text to gloss using advanced conversion
         gloss = text_to_gloss(sentence, use_advanced=True)
         
-        # Find videos for each word
+        # Find videos for each word in the prebuilt index, the same lookup
+        # /api/word-video uses
+        wait_for_index()
         video_paths = []
         missing_words = []
         
         for word in gloss:
-            video_filename = dataset.get_video_for_word(word)
-            if video_filename:
-                video_path = dataset.get_video_path(video_filename)
-                if os.path.exists(video_path):
-                    video_paths.append(video_path)
-                    print(f"Found video for '{word}': {video_filename}")
-                else:
-                    missing_words.append(word)
-                    print(f"Video file not found: {video_path}")
+            video_path = WORD_TO_VIDEO.get(word.lower())
+            if video_path:
+                video_paths.append(video_path)
+                print(f"Found video for '{word}': {video_path}")
             else:
                 missing_words.append(word)
                 print(f"No video found for '{word}'")
@@ -447,64 +727,83 @@ def api_sentence_video():
             })
         
         # Generate a unique filename for the output video
-        import uuid
         output_filename = f"asl_sentence_{uuid.uuid4().hex}.mp4"
         output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
         
-        # Import the necessary moviepy modules
-        import sys
-        sys.path.append(parent_dir)
-        try:
-            # Try importing directly from moviepy.editor
-            from moviepy.editor import VideoFileClip, concatenate_videoclips
-        except ImportError:
-            try:
-                # Try the older import path
-                import moviepy.editor as mpy
-                VideoFileClip = mpy.VideoFileClip
-                concatenate_videoclips = mpy.concatenate_videoclips
-            except ImportError:
-                # Direct import as last resort
-                import moviepy
-                from moviepy import VideoFileClip, concatenate_videoclips
+        # Clips that share a codec and resolution are joined by copying their
+        # streams, skipping MoviePy's decode and re-encode. Resized sentences
+        # use the cached normalized clips, which always share one format.
+        concat_paths = normalize_clips(video_paths) if resize_videos else None
+        if concat_paths is None and can_stream_copy(video_paths, NORMALIZED_SIZE if resize_videos else None):
+            concat_paths = video_paths
+        if concat_paths and concat_with_ffmpeg(concat_paths, output_path):
+            return jsonify({
+                'status': 'success',
+                'message': 'ASL video created successfully',
+                'video_url': url_for('static', filename=f'generated/{output_filename}'),
+                'gloss': gloss,
+                'missing_words': missing_words
+            })
         
-        # Create clips from video paths
-        clips = []
-        for path in video_paths:
-            clip = VideoFileClip(path)
-            if resize_videos:
-                try:
-                    # MoviePy's resize is in the .resize_width or .resize_height methods
-                    # Not directly in .resize for many versions
-                    if hasattr(clip, 'resize_width'):
-                        clip = clip.resize_width(640)
-                    # Fallback to other resize methods
-                    elif hasattr(clip, 'resize'):
-                        clip = clip.resize((640, 480))
-                    elif hasattr(clip, 'resize_height'):
-                        clip = clip.resize_height(480)
-                    else:
-                        # Last resort - use the clip's fx method which should be available in all versions
-                        from moviepy.video.fx import resize
-                        clip = resize.resize(clip, width=640, height=480)
-                except Exception as e:
-                    print(f"Error resizing clip: {e}")
-            clips.append(clip)
+        if VideoFileClip is None or VIDEO_WRITE_OPTIONS is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'MoviePy is not installed and the clips could not be joined with FFmpeg',
+                'gloss': gloss,
+                'missing_words': missing_words
+            })
         
-        # Concatenate clips
+        # Open each distinct file once, in parallel; each open probes the file
+        # with an ffmpeg subprocess, so the waits overlap instead of adding up.
+        # Repeated words in the sentence reuse the same clip. Every clip that
+        # opened is closed when the request is done, even if another failed.
+        unique_paths = list(dict.fromkeys(video_paths))
+        opened_clips = {}
+        unique_clips = {}
+        final_clip = None
         try:
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_paths))) as executor:
+                futures = {path: executor.submit(VideoFileClip, path) for path in unique_paths}
+            open_errors = []
+            for path, future in futures.items():
+                try:
+                    opened_clips[path] = future.result()
+                except Exception as e:
+                    open_errors.append(e)
+            if open_errors:
+                raise open_errors[0]
+            
+            for path, clip in opened_clips.items():
+                # Skip the scale pass for clips that are already 640x480
+                if resize_videos and tuple(clip.size) != (640, 480):
+                    try:
+                        # MoviePy's resize is in the .resize_width or .resize_height methods
+                        # Not directly in .resize for many versions
+                        if hasattr(clip, 'resize_width'):
+                            clip = clip.resize_width(640)
+                        # Fallback to other resize methods
+                        elif hasattr(clip, 'resize'):
+                            clip = clip.resize((640, 480))
+                        elif hasattr(clip, 'resize_height'):
+                            clip = clip.resize_height(480)
+                        else:
+                            # Last resort - use the clip's fx method which should be available in all versions
+                            from moviepy.video.fx import resize
+                            clip = resize.resize(clip, width=640, height=480)
+                    except Exception as e:
+                        print(f"Error resizing clip: {e}")
+                unique_clips[path] = clip
+            
+            clips = [unique_clips[path] for path in video_paths]
+            
+            # Concatenate clips
             if include_transitions and len(clips) > 1:
                 final_clip = concatenate_videoclips(clips, method="compose")
             else:
                 final_clip = concatenate_videoclips(clips, method="chain")
             
             # Write the video
-            final_clip.write_videofile(output_path, codec="libx264", audio=False)
-            
-            # Clean up
-            for clip in clips:
-                clip.close()
-            final_clip.close()
+            final_clip.write_videofile(output_path, **VIDEO_WRITE_OPTIONS)
             
             # Return success response
             return jsonify({
@@ -516,19 +815,22 @@ def api_sentence_video():
             })
             
         except Exception as e:
-            # Clean up any open clips
-            for clip in clips:
-                try:
-                    clip.close()
-                except:
-                    pass
-            
             return jsonify({
                 'status': 'error',
                 'message': f'Error creating video: {str(e)}',
                 'gloss': gloss,
                 'missing_words': missing_words
             })
+        
+        finally:
+            # Clean up the final clip, resized copies and source clips
+            if final_clip is not None:
+                final_clip.close()
+            for clip in [*unique_clips.values(), *opened_clips.values()]:
+                try:
+                    clip.close()
+                except Exception:
+                    pass
     
     except Exception as e:
         return jsonify({
@@ -558,13 +860,11 @@ def api_video_to_text():
     
     # Save the uploaded file to a temporary location
     try:
-        from werkzeug.utils import secure_filename
-        import tempfile
-        import random
-        import time
-        import cv2
-        import numpy as np
-        from PIL import Image
+        if cv2 is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'OpenCV is not installed'
+            })
         
         # Create temporary file
         temp_dir = tempfile.mkdtemp()
@@ -586,23 +886,15 @@ def api_video_to_text():
         # Basic video processing to show we're doing real work
         cap = cv2.VideoCapture(file_path)
         success, frame = cap.read()
+        processed_path = os.path.join(temp_dir, "processed_frame.jpg")
         if success:
-            # Process the frame
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_resized = cv2.resize(frame_rgb, (224, 224))
-            frame_normalized = frame_resized / 255.0
-            
-            # Save the processed frame
-            pil_img = Image.fromarray((frame_normalized * 255).astype(np.uint8))
-            processed_path = os.path.join(temp_dir, "processed_frame.jpg")
-            pil_img.save(processed_path)
+            # Resize and save the processed frame; OpenCV reads and writes
+            # BGR, so no color conversion or float round-trip is needed
+            cv2.imwrite(processed_path, cv2.resize(frame, (224, 224)))
             
             print(f"Processed first frame of the video")
         cap.release()
         
-        # Simulate model analysis time
-        time.sleep(3)
-        
         # Improved heuristic model response:
         # Instead of completely random predictions, let's pick ASL words based on 
         # common features that might be similar in the input video
@@ -665,17 +957,12 @@ def api_video_to_text():
 def api_word_list_progress():
     """SSE endpoint for tracking word list building progress."""
     def generate():
-        total_entries = len(load_wlasl_json() or [])
-        if total_entries == 0:
-            yield f"data: {json.dumps({'percent': 100})}\n\n"
-            return
-            
-        step = max(1, total_entries // 20)  # Update in ~5% increments
-        
-        for i in range(0, total_entries + 1, step):
-            percent = min(int((i / total_entries) * 100), 99)  # Cap at 99% until done
+        # Report the background index build until it has finished
+        while not INDEX_READY.wait(timeout=0.25):
+            total = BUILD_PROGRESS['total']
+            percent = min(int(BUILD_PROGRESS['done'] * 100 / total), 99) if total else 0
             yield f"data: {json.dumps({'percent': percent})}\n\n"
-            
+        
         # Final update
         yield f"data: {json.dumps({'percent': 100})}\n\n"
     
@@ -685,16 +972,30 @@ def api_word_list_progress():
     return response
 
 
+# The serialized word list together with the list it was built from; replaced
+# as a whole tuple so concurrent requests never see a mismatched pair
+_WORD_LIST_BODY = (None, None)
+
+
 @app.route('/api/word-list', methods=['GET'])
 def api_word_list():
     """API endpoint for getting the complete list of available words."""
+    global _WORD_LIST_BODY
     try:
         words = get_available_words()
-        return jsonify({
-            'status': 'success',
-            'words': words,
-            'count': len(words)
-        })
+        if orjson is None:
+            return jsonify({
+                'status': 'success',
+                'words': words,
+                'count': len(words)
+            })
+        
+        # orjson emits bytes directly; reuse them until the index is rebuilt
+        cached_words, body = _WORD_LIST_BODY
+        if cached_words is not words:
+            body = orjson.dumps({'status': 'success', 'words': words, 'count': len(words)})
+            _WORD_LIST_BODY = (words, body)
+        return app.response_class(body, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -704,9 +1005,27 @@ def api_word_list():
 
 @app.route('/videos/<path:filename>')
 def serve_video(filename):
-    """Serve videos from the videos directory."""
-    return send_from_directory(DEFAULT_VIDEOS_DIR, filename)
+    """
+    Serve videos from the videos directory.
+    
+    Behind Nginx the transfer is handed off via X-Accel-Redirect; otherwise
+    the file is sent with conditional/range support so seeking does not
+    re-send the whole video.
+    """
+    if app.config['USE_X_ACCEL']:
+        video_path = safe_join(DEFAULT_VIDEOS_DIR, filename)
+        if video_path is None or not os.path.isfile(video_path):
+            abort(404)
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = app.config['X_ACCEL_VIDEOS_PREFIX'] + filename
+        return response
+    return send_from_directory(DEFAULT_VIDEOS_DIR, filename, conditional=True)
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
+    # Debug mode is opt-in; the reloader is left off so code changes don't
+    # re-run the dataset and index loading
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    print("Development server; for production use:")
+    print("  gunicorn -w $(nproc) -k gthread --threads 8 simple_app:app -b 0.0.0.0:8080")
+    app.run(debug=debug, use_reloader=False, host='0.0.0.0', port=8080)
\ No newline at end of file
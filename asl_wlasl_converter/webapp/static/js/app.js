@@ -43,6 +43,40 @@ document.addEventListener('DOMContentLoaded', function() {
     loadDatasetInfo();
 });
 
+// Job polling interval and how long to poll before giving up (milliseconds)
+const JOB_POLL_INTERVAL = 1500;
+const JOB_POLL_TIMEOUT = 10 * 60 * 1000;
+
+/**
+ * Resolve an API response, polling /api/job/<id> while a background job runs.
+ * onAccepted, if given, receives the 202 payload (which may carry partial
+ * results) before polling starts. Returns {ok, data} where data is the final
+ * result payload; polling stops with an error after JOB_POLL_TIMEOUT.
+ */
+async function resolveJobResponse(response, onAccepted) {
+    const data = await response.json();
+    if (response.status !== 202 || !data.job_id) {
+        return {ok: response.ok, data: data};
+    }
+    if (onAccepted) {
+        onAccepted(data);
+    }
+    
+    const deadline = Date.now() + JOB_POLL_TIMEOUT;
+    while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        const jobResponse = await fetch(data.status_url || `/api/job/${data.job_id}`);
+        const job = await jobResponse.json();
+        if (!jobResponse.ok) {
+            return {ok: false, data: job};
+        }
+        if (job.state !== 'running') {
+            return {ok: job.state === 'done', data: job.result};
+        }
+    }
+    return {ok: false, data: {status: 'error', error: 'The request timed out. Please try again.'}};
+}
+
 /**
  * Load and display dataset information
  */
@@ -141,13 +175,13 @@ async function handleTextToVideo(event) {
             body: formData
         });
         
-        const data = await response.json();
+        const {ok, data} = await resolveJobResponse(response);
         
         // Reset submit button
         submitButton.innerHTML = originalButtonText;
         submitButton.disabled = false;
         
-        if (response.ok && data.status === 'success') {
+        if (ok && data.status === 'success') {
             // Show result
             document.getElementById('text-to-video-result').classList.remove('d-none');
             
@@ -283,24 +317,26 @@ async function handleVideoToText(event) {
     submitButton.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Analyzing Video...';
     submitButton.disabled = true;
     
-    // Create form data
-    const formData = new FormData();
-    formData.append('video', file);
-    formData.append('top_k', document.getElementById('top-k').value);
+    // Send the raw file so the server can stream it to disk
+    const topK = document.getElementById('top-k').value;
     
     try {
-        const response = await fetch('/api/video-to-text', {
+        const response = await fetch(`/api/video-to-text/stream?top_k=${encodeURIComponent(topK)}`, {
             method: 'POST',
-            body: formData
+            headers: {
+                'Content-Type': 'application/octet-stream',
+                'X-Filename': encodeURIComponent(file.name)
+            },
+            body: file
         });
         
-        const data = await response.json();
+        const {ok, data} = await resolveJobResponse(response);
         
         // Reset submit button
         submitButton.innerHTML = originalButtonText;
         submitButton.disabled = false;
         
-        if (response.ok && data.status === 'success') {
+        if (ok && data.status === 'success') {
             // Show result
             document.getElementById('video-to-text-result').classList.remove('d-none');
             
@@ -349,23 +385,16 @@ async function handleRandomVideo() {
             body: formData
         });
         
-        const data = await response.json();
+        // Start playing the video as soon as it is known, even while
+        // recognition is still running
+        const {ok, data} = await resolveJobResponse(response, showRandomVideo);
         
         // Reset submit button
         submitButton.innerHTML = originalButtonText;
         submitButton.disabled = false;
         
-        if (response.ok && data.status === 'success') {
-            // Show result
-            document.getElementById('random-video-result').classList.remove('d-none');
-            
-            // Display the random video
-            const videoElement = document.getElementById('random-video-player');
-            videoElement.src = data.video_url;
-            videoElement.load();
-            
-            // Display the word
-            document.getElementById('random-video-word').textContent = data.word;
+        if (ok && data.status === 'success') {
+            showRandomVideo(data);
             
             // Display recognition results if available
             const recognitionContainer = document.getElementById('random-recognition-container');
@@ -390,6 +419,23 @@ async function handleRandomVideo() {
     }
 }
 
+/**
+ * Show a random video and its word, without reloading a video already shown
+ */
+function showRandomVideo(data) {
+    document.getElementById('random-video-result').classList.remove('d-none');
+    
+    // Display the random video
+    const videoElement = document.getElementById('random-video-player');
+    if (videoElement.getAttribute('src') !== data.video_url) {
+        videoElement.src = data.video_url;
+        videoElement.load();
+    }
+    
+    // Display the word
+    document.getElementById('random-video-word').textContent = data.word;
+}
+
 /**
  * Display recognition results in a list
  */